@@ -1,6 +1,7 @@
 from fastapi import APIRouter
-from app.api.endpoints import flights, stats
+from app.api.endpoints import flights, schedules, stats
 
 api_router = APIRouter()
 api_router.include_router(flights.router, prefix="/flights", tags=["flights"])
+api_router.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
 api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
\ No newline at end of file
@@ -0,0 +1,83 @@
+import hashlib
+import uuid
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from urllib.parse import urlencode
+
+from fastapi import Request, Response
+
+from app.services.catalog_cache import catalog_cache
+
+# Versions restart at 0 with the process, so ETags from a previous run must not match
+BOOT_ID = uuid.uuid4().hex
+
+
+def _last_modified() -> datetime:
+    last_write = catalog_cache.last_modified
+    ttl = catalog_cache.ttl_seconds
+    if ttl:
+        epoch_start = datetime.fromtimestamp(catalog_cache.epoch() * ttl, timezone.utc)
+        return max(last_write, epoch_start)
+    return last_write
+
+
+def catalog_etag(request: Request) -> str:
+    """Strong ETag for a catalog read: catalog version + path + normalized query + Accept"""
+    query = urlencode(sorted(request.query_params.multi_items()))
+    key = "|".join((
+        BOOT_ID,
+        str(catalog_cache.version),
+        str(catalog_cache.epoch()),
+        request.url.path,
+        query,
+        request.headers.get("accept", ""),
+    ))
+    return '"' + hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip() for tag in if_none_match.split(","))
+    return etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+def _not_modified_since(if_modified_since: str, last_modified: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def conditional_response(request: Request, response: Response) -> Optional[Response]:
+    """
+    Set ETag/Last-Modified on `response` from the catalog version and return a
+    304 to send instead when the client's copy is still current.
+
+    Call this before reading the database: a write landing after it only makes
+    the stored ETag stale, never pairs a new ETag with old data.
+    """
+    etag = catalog_etag(request)
+    last_modified = _last_modified()
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Vary": "Accept",
+    }
+    response.headers.update(headers)
+    if "cache-control" not in response.headers:
+        # Let clients keep a copy but always revalidate it
+        response.headers["Cache-Control"] = "no-cache"
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+    if fresh:
+        return Response(status_code=304, headers=dict(response.headers))
+    return None
@@ -1,42 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import timedelta
 
-from ...core.database import get_db
+from ...core.database import get_async_db
 from ...core.config import settings
 from ...core.security import create_access_token
 from ...schemas.token import Token
 from ...schemas.user import User, UserCreate
-from ...services.auth_service import AuthService, get_current_user
+from ...services.auth_service import AuthService, authenticate_user, get_current_user
+from ...services.password_hasher import password_hasher
 
 router = APIRouter()
 
 @router.post("/register", response_model=User)
-async def register_user(user_in: UserCreate, db: Session = Depends(get_db)):
+async def register_user(user_in: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Register a new user
     """
-    auth_service = AuthService(db)
-    
-    user = auth_service.create_user(
+    hashed_password = await password_hasher.hash(user_in.password)
+    user = await db.run_sync(lambda session: AuthService(session).create_user(
         email=user_in.email,
         username=user_in.username,
-        password=user_in.password,
-        full_name=user_in.full_name,
-        is_admin=user_in.is_admin
-    )
+        hashed_password=hashed_password,
+        full_name=user_in.full_name
+    ))
     
     return user
 
 @router.post("/login", response_model=Token)
-async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    auth_service = AuthService(db)
-    
-    user = auth_service.authenticate_user(form_data.username, form_data.password)
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -1,71 +1,77 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.schemas.booking import BookingCreateMulti, BookingMulti, Booking
-from app.models.flight import Flight
-from app.models.booking import Booking as BookingModel
-from sqlalchemy.exc import IntegrityError
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import get_async_db
+from app.schemas.booking import BookingCreateMulti, BookingMulti, Booking, BookingPage, SeatHold, SeatHoldCreate, SeatMap
+from app.services.auth_service import get_current_user
+from app.services.booking_service import BookingService
+from app.services.principal_cache import Principal
+from typing import List, Optional
 
 router = APIRouter()
 
 @router.get("/flight/{flight_id}/seats", response_model=List[str])
-def get_booked_seats(
+async def get_booked_seats(
     flight_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all booked seat numbers for a specific flight"""
-    # Check flight exists
-    flight = db.query(Flight).filter(Flight.id == flight_id).first()
-    if not flight:
-        raise HTTPException(status_code=404, detail="Flight not found")
-    
-    # Get all confirmed bookings for this flight
-    booked_seats = db.query(BookingModel.seat_number).filter(
-        BookingModel.flight_id == flight_id,
-        BookingModel.booking_status == "confirmed"
-    ).all()
-    
-    return [seat[0] for seat in booked_seats]
+    return await db.run_sync(lambda session: BookingService(session).get_booked_seats(flight_id))
 
-@router.post("/", response_model=List[Booking], status_code=status.HTTP_201_CREATED)
-def create_booking_multi(
-    booking: BookingCreateMulti,
-    db: Session = Depends(get_db)
+@router.get("/flight/{flight_id}/seat-map", response_model=SeatMap)
+async def get_seat_map(
+    flight_id: int,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    # Check flight exists
-    flight = db.query(Flight).filter(Flight.id == booking.flight_id).first()
-    if not flight:
-        raise HTTPException(status_code=404, detail="Flight not found")
-    if len(booking.seat_numbers) > flight.available_seats:
-        raise HTTPException(status_code=400, detail="Not enough available seats")
-
-    # Check for seat conflicts
-    existing_seats = set(
-        b.seat_number for b in db.query(BookingModel).filter(
-            BookingModel.flight_id == booking.flight_id,
-            BookingModel.seat_number.in_(booking.seat_numbers),
-            BookingModel.booking_status == "confirmed"
-        ).all()
-    )
-    conflict_seats = set(booking.seat_numbers) & existing_seats
-    if conflict_seats:
-        raise HTTPException(status_code=409, detail=f"Seats already booked: {', '.join(conflict_seats)}")
+    """Get the booked seats of a flight as a bitmap and its run-length encoding"""
+    return await db.run_sync(lambda session: BookingService(session).get_seat_map(flight_id))
 
-    # Create bookings for each seat
-    bookings = []
-    for seat in booking.seat_numbers:
-        new_booking = BookingModel(
-            user_id=booking.user_id,
-            flight_id=booking.flight_id,
-            booking_reference=booking.booking_reference,
-            seat_number=seat,
-            booking_status="confirmed"
+@router.get("/user/{user_id}", response_model=BookingPage)
+async def get_user_bookings(
+    user_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get a user's bookings, newest first; pass `next_cursor` back as `cursor`
+    for older ones. Users see their own bookings, admins anyone's.
+    """
+    if user_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to view this user's bookings")
+    try:
+        items, next_cursor = await db.run_sync(
+            lambda session: BookingService(session).get_user_bookings(user_id, limit=limit, cursor=cursor)
         )
-        db.add(new_booking)
-        bookings.append(new_booking)
-    flight.available_seats -= len(booking.seat_numbers)
-    db.commit()
-    for b in bookings:
-        db.refresh(b)
-    return bookings
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.post("/holds", response_model=SeatHold, status_code=status.HTTP_201_CREATED)
+async def hold_seats(
+    hold: SeatHoldCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Reserve seats during checkout. Held seats count as taken until the hold
+    is confirmed (POST / with its hold_token), released, or expires.
+    """
+    return await db.run_sync(lambda session: BookingService(session).hold_seats(hold))
+
+@router.delete("/holds/{hold_token}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold(
+    hold_token: str,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Give held seats back before the hold expires"""
+    released = await db.run_sync(lambda session: BookingService(session).release_hold(hold_token))
+    if not released:
+        raise HTTPException(status_code=404, detail="Seat hold not found")
+    return None
+
+@router.post("/", response_model=List[Booking], status_code=status.HTTP_201_CREATED)
+async def create_booking_multi(
+    booking: BookingCreateMulti,
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await db.run_sync(lambda session: BookingService(session).create_bookings(booking))
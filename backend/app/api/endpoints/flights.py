@@ -1,35 +1,137 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from datetime import date
+import asyncio
+import tempfile
 
-from app.core.database import get_db
-from app.schemas.flight import Flight, FlightCreate, FlightUpdate
-from app.services.flight_service import FlightService
+from app.api.conditional import conditional_response
+from app.core.config import settings
+from app.core.database import get_async_db, get_db, get_session_factory
+from app.schemas.airline import Airline
+from app.schemas.flight import Flight, FlightCreate, FlightUpdate, FlightPage, Itinerary, FareDay
+from app.services.connection_service import ConnectionService
+from app.services.flight_encoding import (
+    ARROW_MEDIA_TYPE, COLUMNS_MEDIA_TYPE, CSV_MEDIA_TYPE, NDJSON_MEDIA_TYPE,
+    columnar_encoders, csv_chunks, encode_json, encode_json_array, ndjson_chunks
+)
+from app.services.auth_service import get_current_admin_user
+from app.services.flight_loader import load_flights_file
+from app.services.flight_service import FLIGHT_FIELDS, AsyncFlightService, FlightService
+from app.services.principal_cache import Principal
 
 router = APIRouter()
 
 @router.get("/airlines", response_model=List[str])
-async def get_airlines(db: Session = Depends(get_db)):
+async def get_airlines(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
     """
     Get all unique airlines from flights
     """
-    flight_service = FlightService(db)
-    return flight_service.get_airlines()
+    not_modified = conditional_response(request, response)
+    if not_modified is not None:
+        return not_modified
+    flight_service = AsyncFlightService(db)
+    return await flight_service.get_airlines()
+
+@router.get("/airlines/details", response_model=List[Airline])
+async def get_airline_details(request: Request, response: Response, db: AsyncSession = Depends(get_async_db)):
+    """
+    Get all airlines in service with their full names
+    """
+    not_modified = conditional_response(request, response)
+    if not_modified is not None:
+        return not_modified
+    flight_service = AsyncFlightService(db)
+    return await flight_service.get_airline_details()
 
 @router.get("/price-range", response_model=dict)
 async def get_price_range(
+    request: Request,
+    response: Response,
     travelers: int = 1,
+    departure_city: Optional[str] = None,
+    arrival_city: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the min and max prices from all flights (or one route), adjusted for number of travelers
+    """
+    response.headers["Cache-Control"] = f"public, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}"
+    not_modified = conditional_response(request, response)
+    if not_modified is not None:
+        return not_modified
+    flight_service = AsyncFlightService(db)
+    return await flight_service.get_price_range(
+        travelers=travelers,
+        departure_city=departure_city,
+        arrival_city=arrival_city
+    )
+
+@router.get("/fare-calendar", response_model=List[FareDay])
+async def get_fare_calendar(
+    response: Response,
+    departure_city: str,
+    arrival_city: str,
+    start_date: Optional[date] = None,
+    days: int = Query(30, ge=1, le=90),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the cheapest fare and number of flights for each day of a route
+    """
+    flight_service = AsyncFlightService(db)
+    response.headers["Cache-Control"] = f"public, max-age={settings.CATALOG_CACHE_MAX_AGE_SECONDS}"
+    return await flight_service.get_fare_calendar(
+        departure_city=departure_city,
+        arrival_city=arrival_city,
+        start_date=start_date or date.today(),
+        days=days
+    )
+
+@router.get("/connections", response_model=List[Itinerary])
+async def search_connections(
+    departure_city: str,
+    arrival_city: str,
+    date: date,
+    max_stops: int = Query(1, ge=0, le=3),
+    min_layover_minutes: int = Query(45, ge=0),
+    max_layover_minutes: int = Query(360, ge=1, le=24 * 60),
+    sort_by: str = Query("price", pattern="^(price|duration)$"),
+    travelers: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
     """
-    Get the min and max prices from all flights, adjusted for number of travelers
+    Find direct and connecting itineraries departing on the given date,
+    ranked by total price or total duration
     """
-    flight_service = FlightService(db)
-    return flight_service.get_price_range(travelers=travelers)
+    if min_layover_minutes > max_layover_minutes:
+        raise HTTPException(status_code=400, detail="min_layover_minutes must not exceed max_layover_minutes")
+    connection_service = ConnectionService(db)
+    return await connection_service.search_async(
+        departure_city=departure_city,
+        arrival_city=arrival_city,
+        date=date,
+        max_stops=max_stops,
+        min_layover_minutes=min_layover_minutes,
+        max_layover_minutes=max_layover_minutes,
+        sort_by=sort_by,
+        travelers=travelers,
+        limit=limit
+    )
 
-@router.get("/", response_model=List[Flight])
+def _stream_encoded(db: Session, encoded):
+    try:
+        yield from encoded
+    finally:
+        db.close()
+
+@router.get("/", response_model=Union[List[Flight], FlightPage])
 async def list_flights(
+    request: Request,
+    response: Response,
     departure_city: Optional[str] = None,
     arrival_city: Optional[str] = None,
     date: Optional[date] = None,
@@ -37,16 +139,37 @@ async def list_flights(
     min_price: Optional[float] = None,
     max_price: Optional[float] = None,
     dep_time_start: Optional[str] = None,  # 'HH:MM' format
-    dep_time_end: Optional[str] = None,    # 'HH:MM' format
+    dep_time_end: Optional[str] = None,    # 'HH:MM' format, may be earlier than start to wrap midnight
     skip: int = Query(0, ge=0),
     limit: int = Query(1000, ge=1, le=10000),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,  # Opaque keyset cursor; pass an empty value for the first page
+    format: Optional[str] = Query(None, pattern="^(json|ndjson|csv|columns|arrow)$"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    List all flights with optional filtering and pagination
+    List all flights with optional filtering and pagination.
+
+    Passing `cursor` switches to keyset pagination and returns
+    `{"items": [...], "next_cursor": ...}`; `skip` is kept for backward
+    compatibility only.
+
+    `format=ndjson|csv` (or `Accept: application/x-ndjson` / `text/csv`)
+    streams the results instead; without an explicit `limit` every
+    matching flight is exported.
+
+    `format=columns` (`Accept: application/vnd.flights.columns+msgpack`) or
+    `format=arrow` (`Accept: application/vnd.apache.arrow.stream`) return the
+    same rows as typed column arrays for bulk consumers; see
+    `flight_encoding.encode_msgpack_columns` for the msgpack layout.
+
+    Responses carry an ETag derived from the catalog version; a matching
+    `If-None-Match` gets a 304 without querying the database.
     """
-    flight_service = FlightService(db)
-    return flight_service.get_flights(
+    not_modified = conditional_response(request, response)
+    if not_modified is not None:
+        return not_modified
+    flight_service = AsyncFlightService(db)
+    filters = dict(
         departure_city=departure_city,
         arrival_city=arrival_city,
         date=date,
@@ -54,21 +177,74 @@ async def list_flights(
         min_price=min_price,
         max_price=max_price,
         dep_time_start=dep_time_start,
-        dep_time_end=dep_time_end,
-        skip=skip,
-        limit=limit
+        dep_time_end=dep_time_end
     )
+    accept = request.headers.get("accept", "")
+    if format is None:
+        if NDJSON_MEDIA_TYPE in accept:
+            format = "ndjson"
+        elif CSV_MEDIA_TYPE in accept:
+            format = "csv"
+        elif COLUMNS_MEDIA_TYPE in accept:
+            format = "columns"
+        elif ARROW_MEDIA_TYPE in accept:
+            format = "arrow"
+    if format in ("ndjson", "csv"):
+        encode, media_type = (ndjson_chunks, NDJSON_MEDIA_TYPE) if format == "ndjson" else (csv_chunks, CSV_MEDIA_TYPE)
+        stream_limit = limit if "limit" in request.query_params else None
+        # The response outlives the request-scoped session, so the stream owns its own
+        stream_db = get_session_factory()()
+        try:
+            chunks = FlightService(stream_db).iter_flight_rows(skip=skip, limit=stream_limit, **filters)
+        except ValueError as e:
+            stream_db.close()
+            raise HTTPException(status_code=400, detail=str(e))
+        return StreamingResponse(
+            _stream_encoded(stream_db, encode(chunks)), media_type=media_type, headers=dict(response.headers)
+        )
+    if format in ("columns", "arrow"):
+        encoders = columnar_encoders()
+        if format not in encoders:
+            raise HTTPException(status_code=406, detail=f"The {format} format is not available on this server")
+    # Lightweight read path: plain column tuples encoded straight to the
+    # response bytes; JSON matches what response_model validation would produce
+    try:
+        if cursor is not None:
+            rows, next_cursor = await flight_service.get_flight_rows_page(cursor=cursor, limit=limit, **filters)
+        else:
+            rows = await flight_service.get_flight_rows(skip=skip, limit=limit, **filters)
+            next_cursor = None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if format in ("columns", "arrow"):
+        encode, media_type = encoders[format]
+        content = encode(rows, next_cursor)
+    elif cursor is not None:
+        media_type = "application/json"
+        content = encode_json({
+            "items": [dict(zip(FLIGHT_FIELDS, row)) for row in rows],
+            "next_cursor": next_cursor
+        })
+    else:
+        media_type = "application/json"
+        content = encode_json_array(rows)
+    return Response(content=content, media_type=media_type, headers=dict(response.headers))
 
 @router.get("/{flight_id}", response_model=Flight)
 async def get_flight(
     flight_id: int,
-    db: Session = Depends(get_db)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific flight by ID
     """
-    flight_service = FlightService(db)
-    flight = flight_service.get_flight(flight_id)
+    not_modified = conditional_response(request, response)
+    if not_modified is not None:
+        return not_modified
+    flight_service = AsyncFlightService(db)
+    flight = await flight_service.get_flight(flight_id)
     if flight is None:
         raise HTTPException(status_code=404, detail="Flight not found")
     return flight
@@ -76,25 +252,62 @@ async def get_flight(
 @router.post("/", response_model=Flight, status_code=status.HTTP_201_CREATED)
 async def create_flight(
     flight: FlightCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new flight
     """
-    flight_service = FlightService(db)
-    return flight_service.create_flight(flight)
+    flight_service = AsyncFlightService(db)
+    return await flight_service.create_flight(flight)
     
+@router.post("/bulk", response_model=dict)
+async def bulk_load_flights(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$"),
+    batch_size: int = Query(settings.FLIGHT_LOAD_BATCH_SIZE, ge=1, le=50000),
+    current_user: Principal = Depends(get_current_admin_user)
+):
+    """
+    Insert or update flights by flight_number from a CSV (header row) or NDJSON
+    request body (admins only, at most FLIGHT_LOAD_MAX_UPLOAD_BYTES). The
+    format defaults from the Content-Type. The body is spooled to disk rather
+    than held in memory; the load runs as one transaction and reports
+    rejected rows and rows/sec.
+    """
+    if format is None:
+        content_type = request.headers.get("content-type", "")
+        format = "ndjson" if "ndjson" in content_type or "jsonl" in content_type else "csv"
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload exceeds {settings.FLIGHT_LOAD_MAX_UPLOAD_BYTES} bytes"
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > settings.FLIGHT_LOAD_MAX_UPLOAD_BYTES:
+        raise too_large
+    spool = await asyncio.to_thread(tempfile.TemporaryFile)
+    try:
+        received = 0
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > settings.FLIGHT_LOAD_MAX_UPLOAD_BYTES:
+                raise too_large
+            await asyncio.to_thread(spool.write, chunk)
+        spool.seek(0)
+        return await asyncio.to_thread(load_flights_file, spool, format, batch_size)
+    finally:
+        spool.close()
+
 @router.put("/{flight_id}", response_model=Flight)
 async def update_flight(
     flight_id: int,
     flight: FlightUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing flight
     """
-    flight_service = FlightService(db)
-    updated_flight = flight_service.update_flight(flight_id, flight)
+    flight_service = AsyncFlightService(db)
+    updated_flight = await flight_service.update_flight(flight_id, flight)
     if updated_flight is None:
         raise HTTPException(status_code=404, detail="Flight not found")
     return updated_flight
@@ -102,13 +315,13 @@ async def update_flight(
 @router.delete("/{flight_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_flight(
     flight_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a flight
     """
-    flight_service = FlightService(db)
-    success = flight_service.delete_flight(flight_id)
+    flight_service = AsyncFlightService(db)
+    success = await flight_service.delete_flight(flight_id)
     if not success:
         raise HTTPException(status_code=404, detail="Flight not found")
     return None
\ No newline at end of file
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.core.database import get_async_db
+from app.schemas.schedule import (
+    FlightSchedule, FlightScheduleCreate, FlightScheduleUpdate, ScheduleOverride, ScheduleOverrideCreate
+)
+from app.services.schedule_service import ScheduleService
+
+router = APIRouter()
+
+@router.get("/", response_model=List[FlightSchedule])
+async def get_schedules(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List recurring flight schedules"""
+    return await db.run_sync(lambda session: ScheduleService(session).get_schedules(skip, limit))
+
+@router.post("/", response_model=FlightSchedule, status_code=status.HTTP_201_CREATED)
+async def create_schedule(
+    schedule: FlightScheduleCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create a schedule; its flights within the rolling horizon are created right away"""
+    return await db.run_sync(lambda session: ScheduleService(session).create_schedule(schedule))
+
+@router.put("/{schedule_id}", response_model=FlightSchedule)
+async def update_schedule(
+    schedule_id: int,
+    schedule: FlightScheduleUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update a schedule; flights already created from it are not changed"""
+    updated = await db.run_sync(lambda session: ScheduleService(session).update_schedule(schedule_id, schedule))
+    if updated is None:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    return updated
+
+@router.put("/{schedule_id}/overrides", response_model=ScheduleOverride)
+async def set_schedule_override(
+    schedule_id: int,
+    override: ScheduleOverrideCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Cancel or change the price or capacity of one future service date"""
+    return await db.run_sync(lambda session: ScheduleService(session).set_override(schedule_id, override))
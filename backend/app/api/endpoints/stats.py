@@ -1,39 +1,88 @@
-from fastapi import APIRouter, Depends
+from datetime import date, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from datetime import datetime
-from app.core.database import get_db
-from app.models.flight import Flight
-from app.models.booking import Booking
+from app.core.config import settings
+from app.core.database import get_db, pool_status
+from app.services.password_hasher import password_hasher
+from app.services.principal_cache import principal_cache
+from app.services.rollups import RollupService
+from app.services.stats_counters import stats_counters
 
 router = APIRouter()
 
 @router.get("/", summary="Get admin dashboard stats")
 def get_stats(db: Session = Depends(get_db)):
-    try:
-        from sqlalchemy import func
-        now = datetime.now()
-        
-        # Optimized single query to get all stats at once
-        stats = db.query(
-            func.count(Flight.id).label('total_flights'),
-            func.sum(func.case([(Flight.departure_time > now, 1)], else_=0)).label('upcoming_flights')
-        ).first()
-        
-        # Get bookings count separately (fast query)
-        total_bookings = db.query(func.count(Booking.id)).scalar() or 0
-        
-        return {
-            "total_flights": int(stats.total_flights or 0),
-            "total_bookings": int(total_bookings),
-            "upcoming_flights": int(stats.upcoming_flights or 0)
-        }
-    except Exception as e:
-        # Fallback to simple queries if optimized version fails
-        total_flights = db.query(Flight).count()
-        total_bookings = db.query(Booking).count()
-        upcoming_flights = db.query(Flight).filter(Flight.departure_time > now).count()
-        return {
-            "total_flights": total_flights,
-            "total_bookings": total_bookings,
-            "upcoming_flights": upcoming_flights
-        }
\ No newline at end of file
+    """
+    Served from in-memory counters, so the cost does not grow with the tables;
+    only the first call after startup counts rows (see services/stats_counters.py).
+    """
+    stats_counters.ensure_loaded(db)
+    return stats_counters.snapshot()
+
+def _series_range(start_date: Optional[date], end_date: Optional[date]):
+    end_date = end_date or date.today()
+    start_date = start_date or end_date - timedelta(days=29)
+    if start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date must not be after end_date")
+    if (end_date - start_date).days > 366:
+        raise HTTPException(status_code=400, detail="Date range is limited to 366 days")
+    return start_date, end_date
+
+@router.get("/timeseries/flights", summary="Flights, seats sold and load factor over time")
+def get_flight_timeseries(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = Query("day", pattern="^(day|route|airline)$"),
+    departure_city: Optional[str] = None,
+    arrival_city: Optional[str] = None,
+    airline_code: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    By departure date (default: the last 30 days), read from the route rollups
+    only; flights edited within the last ROLLUP_REFRESH_INTERVAL_SECONDS may not show yet.
+    """
+    start_date, end_date = _series_range(start_date, end_date)
+    return RollupService(db).route_series(
+        start_date, end_date, group_by, departure_city, arrival_city, airline_code
+    )
+
+@router.get("/timeseries/bookings", summary="Seats sold and revenue over time")
+def get_booking_timeseries(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    group_by: str = Query("day", pattern="^(day|route|airline)$"),
+    departure_city: Optional[str] = None,
+    arrival_city: Optional[str] = None,
+    airline_code: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """By booking date in UTC (default: the last 30 days), read from the booking rollups only"""
+    start_date, end_date = _series_range(start_date, end_date)
+    return RollupService(db).booking_series(
+        start_date, end_date, group_by, departure_city, arrival_city, airline_code
+    )
+
+@router.get("/pool", summary="Get live database connection pool stats")
+def get_pool_stats():
+    """Checkouts, waits, overflow and connection churn for this worker's pools"""
+    return {
+        "config": {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout_seconds": settings.DB_POOL_TIMEOUT,
+            "statement_timeout_ms": settings.DB_STATEMENT_TIMEOUT_MS,
+        },
+        "pools": pool_status()
+    }
+
+@router.get("/auth-cache", summary="Get token cache stats")
+def get_auth_cache_stats():
+    """Hits, misses and evictions of this worker's token-to-user cache"""
+    return principal_cache.stats()
+
+@router.get("/password-hashing", summary="Get password hashing pool stats")
+def get_password_hashing_stats():
+    """Queue depth, queue wait and rejections of this worker's bcrypt pool"""
+    return password_hasher.stats()
@@ -1,16 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
-from ...core.database import get_db
+from ...core.database import get_async_db
 from ...schemas.user import User, UserUpdate
 from ...services.auth_service import get_current_user, get_current_admin_user
+from ...services.password_hasher import password_hasher
+from ...services.principal_cache import Principal, principal_cache
 from ...models.user import User as UserModel
 
 router = APIRouter()
 
 @router.get("/profile", response_model=User)
-async def get_user_profile(current_user: UserModel = Depends(get_current_user)):
+async def get_user_profile(current_user: Principal = Depends(get_current_user)):
     """
     Get current user profile
     """
@@ -19,41 +21,58 @@ async def get_user_profile(current_user: UserModel = Depends(get_current_user)):
 @router.put("/profile", response_model=User)
 async def update_user_profile(
     user_update: UserUpdate, 
-    current_user: UserModel = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user profile
     """
-    # Update user fields
-    if user_update.email is not None:
-        current_user.email = user_update.email
-    
-    if user_update.username is not None:
-        current_user.username = user_update.username
-    
-    if user_update.full_name is not None:
-        current_user.full_name = user_update.full_name
-    
-    # Update password if provided
+    # Hash on the password pool before taking a connection for the update
+    hashed_password = None
     if user_update.password is not None:
-        from ...core.security import get_password_hash
-        current_user.hashed_password = get_password_hash(user_update.password)
-    
-    db.commit()
-    db.refresh(current_user)
+        hashed_password = await password_hasher.hash(user_update.password)
+
+    def update(session):
+        # The cached principal is read-only; load the row to change it
+        user = session.get(UserModel, current_user.id)
+        if user is None:
+            return None
+
+        # Update user fields
+        if user_update.email is not None:
+            user.email = user_update.email
+        
+        if user_update.username is not None:
+            user.username = user_update.username
+        
+        if user_update.full_name is not None:
+            user.full_name = user_update.full_name
+        
+        if hashed_password is not None:
+            user.hashed_password = hashed_password
+        
+        session.commit()
+        session.refresh(user)
+        return user
+
+    user = await db.run_sync(update)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    principal_cache.invalidate_user(user.id)
     
-    return current_user
+    return user
 
 @router.get("/", response_model=List[User])
 async def list_users(
     skip: int = 0,
     limit: int = 100,
-    current_user: UserModel = Depends(get_current_admin_user),
-    db: Session = Depends(get_db)
+    current_user: Principal = Depends(get_current_admin_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get all users (admin only)
     """
-    users = db.query(UserModel).offset(skip).limit(limit).all()
+    users = await db.run_sync(
+        lambda session: session.query(UserModel).offset(skip).limit(limit).all()
+    )
     return users
\ No newline at end of file
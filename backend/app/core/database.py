@@ -1,46 +1,151 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from .config import settings
+from .pool import TimedAsyncQueuePool, TimedQueuePool, instrument_pool
+import asyncio
 import logging
+import threading
+from contextlib import AsyncExitStack
+from functools import lru_cache
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    # Create SQLAlchemy engine
-    engine = create_engine(
-        settings.DATABASE_URL,
-        # Required for SQLite, should be removed for PostgreSQL
-        connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite") else {},
+def pool_options(poolclass) -> dict:
+    """Pool sizing from settings; size workers * (pool_size + max_overflow) against max_connections"""
+    return dict(
+        poolclass=poolclass,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
         pool_pre_ping=True,  # Verify connections before use
         pool_recycle=300     # Recycle connections every 5 minutes
     )
-    
-    # Test the connection
-    with engine.connect() as connection:
+
+def statement_timeout_args(url: str) -> dict:
+    """Per-connection statement_timeout for PostgreSQL drivers (no-op elsewhere)"""
+    timeout = settings.DB_STATEMENT_TIMEOUT_MS
+    driver = make_url(url).drivername
+    if not timeout or not driver.startswith("postgresql"):
+        return {}
+    if driver == "postgresql+asyncpg":
+        return {"server_settings": {"statement_timeout": str(timeout)}}
+    return {"options": f"-c statement_timeout={timeout}"}
+
+# Async driver for each sync driver the app is configured with
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def async_database_url(url: str) -> str:
+    """Same database as DATABASE_URL, reached through an asyncio driver"""
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)).render_as_string(hide_password=False)
+
+# Live pool counters per engine, reported by /api/stats/pool
+pool_stats = {}
+
+# Engines and session factories are built on first use rather than at import,
+# so importing the app (scripts, workers, tests) never waits on the database.
+# The app's startup hook warms the pools instead.
+_engines = {}
+_engine_lock = threading.Lock()
+
+def get_engine():
+    """The sync engine, created on first call"""
+    if "sync" not in _engines:
+        with _engine_lock:
+            if "sync" not in _engines:
+                engine = create_engine(
+                    settings.DATABASE_URL,
+                    # check_same_thread is required for SQLite only
+                    connect_args={"check_same_thread": False} if settings.DATABASE_URL.startswith("sqlite")
+                    else statement_timeout_args(settings.DATABASE_URL),
+                    **pool_options(TimedQueuePool)
+                )
+                pool_stats["sync"] = instrument_pool(engine)
+                _engines["sync"] = engine
+    return _engines["sync"]
+
+def get_async_engine():
+    """The async engine for the async endpoints, created on first call"""
+    if "async" not in _engines:
+        with _engine_lock:
+            if "async" not in _engines:
+                async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+                async_engine = create_async_engine(
+                    async_url,
+                    connect_args=statement_timeout_args(async_url),
+                    **pool_options(TimedAsyncQueuePool)
+                )
+                pool_stats["async"] = instrument_pool(async_engine.sync_engine)
+                _engines["async"] = async_engine
+    return _engines["async"]
+
+@lru_cache(maxsize=None)
+def get_session_factory() -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=get_engine())
+
+@lru_cache(maxsize=None)
+def get_async_session_factory() -> async_sessionmaker:
+    # expire_on_commit=False: responses are serialized after the session's
+    # greenlet context is gone, where expired attributes could not be reloaded
+    return async_sessionmaker(
+        bind=get_async_engine(), class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
+_LAZY_ATTRIBUTES = {
+    "engine": get_engine,
+    "async_engine": get_async_engine,
+    "SessionLocal": get_session_factory,
+    "AsyncSessionLocal": get_async_session_factory,
+}
+
+def __getattr__(name):
+    # Keeps `from app.core.database import engine, SessionLocal` working for scripts
+    if name in _LAZY_ATTRIBUTES:
+        return _LAZY_ATTRIBUTES[name]()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def warm_pool():
+    """Open a sync connection so the first request does not pay for it"""
+    with get_engine().connect():
         logger.info("Database connection successful")
-        
-except Exception as e:
-    logger.error(f"Database connection failed: {e}")
-    # Don't crash, let the app start but log the error
-    engine = None
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async def warm_async_pool(connections: int):
+    """Open up to `connections` async connections concurrently, then return them to the pool"""
+    engine = get_async_engine()
+    connections = max(1, min(connections, settings.DB_POOL_SIZE))
+    async with AsyncExitStack() as stack:
+        await asyncio.gather(*(stack.enter_async_context(engine.connect()) for _ in range(connections)))
+
+def pool_status() -> dict:
+    """Live stats for each engine created so far in this process"""
+    return {name: pool_stats[name].snapshot(engine.pool) for name, engine in _engines.items()}
+
+async def dispose_engines():
+    if "async" in _engines:
+        await _engines["async"].dispose()
+    if "sync" in _engines:
+        _engines["sync"].dispose()
 
 # Create Base class
 Base = declarative_base()
 
 # Dependency
 def get_db():
-    if engine is None:
-        logger.error("Database engine not available")
-        raise Exception("Database connection not available")
-    
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    async with get_async_session_factory()() as db:
+        yield db
@@ -0,0 +1,118 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Pools log under their class's module; keep these as quiet as SQLAlchemy's own
+# pool loggers, which stay at WARNING unless echo_pool is set
+logging.getLogger(__name__).setLevel(logging.WARNING)
+
+
+class PoolStats:
+    """Running counters for one engine's connection pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.checkins = 0
+        self.timeouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+
+    def record_checkout(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds += waited
+            self.max_wait_seconds = max(self.max_wait_seconds, waited)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            stats = {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checkout_timeouts": self.timeouts,
+                "avg_checkout_wait_ms": round(self.wait_seconds / attempts * 1000, 3) if attempts else 0.0,
+                "max_checkout_wait_ms": round(self.max_wait_seconds * 1000, 3),
+                "connections_opened": self.connects,
+                "connections_closed": self.closes,
+                "connections_invalidated": self.invalidations,
+            }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                pool_size=pool.size(),
+                checked_out=pool.checkedout(),
+                checked_in=pool.checkedin(),
+                overflow_in_use=max(pool.overflow(), 0),
+                max_overflow=pool._max_overflow,
+            )
+        return stats
+
+
+class _TimedPoolMixin:
+    """Times how long each checkout waits for a free connection (including connect)"""
+
+    stats: Optional[PoolStats] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.record_checkout(time.perf_counter() - started, timed_out=True)
+            raise
+        if self.stats is not None:
+            self.stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep counting into the same stats
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_pool(engine) -> PoolStats:
+    """Attach a PoolStats to a sync Engine's pool and count connection churn"""
+    stats = PoolStats()
+    engine.pool.stats = stats
+
+    @event.listens_for(engine, "checkin")
+    def _checkin(dbapi_connection, connection_record):
+        stats.increment("checkins")
+
+    @event.listens_for(engine, "connect")
+    def _connect(dbapi_connection, connection_record):
+        stats.increment("connects")
+
+    @event.listens_for(engine, "close")
+    def _close(dbapi_connection, connection_record):
+        stats.increment("closes")
+
+    @event.listens_for(engine, "invalidate")
+    def _invalidate(dbapi_connection, connection_record, exception):
+        stats.increment("invalidations")
+
+    return stats
@@ -1,12 +1,9 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import bcrypt
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from .config import settings
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT token functions
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     to_encode = data.copy()
@@ -19,8 +16,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Password hashing - bcrypt, CPU-bound for PASSWORD_HASH_ROUNDS; async handlers
+# should go through services/password_hasher.py instead of calling these directly
+def _secret(password: str) -> bytes:
+    # bcrypt only uses the first 72 bytes; passlib-era hashes were made from them too
+    return password.encode("utf-8")[:72]
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    try:
+        return bcrypt.checkpw(_secret(plain_password), hashed_password.encode("utf-8"))
+    except (AttributeError, ValueError):
+        return False  # Missing or malformed hash
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(_secret(password), bcrypt.gensalt(rounds=settings.PASSWORD_HASH_ROUNDS)).decode("utf-8")
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when a hash was made with a cost other than PASSWORD_HASH_ROUNDS, e.g. '$2b$12$...'"""
+    try:
+        return int(hashed_password.split("$")[2]) != settings.PASSWORD_HASH_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+def verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password; on success also return a new hash if the stored one uses an outdated cost"""
+    if not verify_password(plain_password, hashed_password):
+        return False, None
+    if password_needs_rehash(hashed_password):
+        return True, get_password_hash(plain_password)
+    return True, None
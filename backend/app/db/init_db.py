@@ -1,6 +1,6 @@
 from app.core.database import Base, engine
 from app.core.database import SessionLocal
-from app.db.seed import seed_flights, seed_users
+from app.db.seed import seed_airlines, seed_flights, seed_users
 
 def init_db():
     # Create all tables
@@ -10,6 +10,7 @@ def init_db():
     db = SessionLocal()
     try:
         # Seed the database
+        seed_airlines(db)
         seed_flights(db)
         seed_users(db)
     finally:
@@ -0,0 +1,121 @@
+from sqlalchemy import inspect, text
+
+from app.core.database import Base, get_engine
+import app.models  # noqa: F401 - register every model on Base.metadata
+from app.services.seat_map import seat_index, to_bytes
+
+
+def add_missing_columns(bind):
+    """create_all() skips existing tables, so add any nullable column declared since"""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    with bind.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                print(f"Added column {table.name}.{column.name}")
+
+
+def drop_stale_unique_indexes(bind):
+    """Drop unique indexes the models now declare as non-unique; create_missing_indexes() recreates them"""
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        declared = {index.name: index for index in table.indexes}
+        for reflected in inspector.get_indexes(table.name):
+            index = declared.get(reflected["name"])
+            if index is not None and reflected.get("unique") and not index.unique:
+                index.drop(bind=bind)
+                print(f"Dropped unique index {reflected['name']}")
+
+
+def create_missing_indexes(bind):
+    """create_all() skips existing tables, so add any index declared since"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=bind, checkfirst=True)
+
+
+def backfill_departure_minutes(bind):
+    """Populate flights.departure_minute for rows written before it existed"""
+    if bind.dialect.name == "sqlite":
+        minute_expr = (
+            "CAST(strftime('%H', departure_time) AS INTEGER) * 60"
+            " + CAST(strftime('%M', departure_time) AS INTEGER)"
+        )
+    else:
+        minute_expr = (
+            "CAST(EXTRACT(HOUR FROM departure_time) * 60"
+            " + EXTRACT(MINUTE FROM departure_time) AS INTEGER)"
+        )
+    with bind.begin() as connection:
+        result = connection.execute(text(
+            f"UPDATE flights SET departure_minute = {minute_expr} WHERE departure_minute IS NULL"
+        ))
+        if result.rowcount:
+            print(f"Backfilled departure_minute for {result.rowcount} flights")
+
+
+def backfill_airline_codes(bind):
+    """Populate flights.airline_code for rows written before it existed"""
+    with bind.begin() as connection:
+        result = connection.execute(text(
+            "UPDATE flights SET airline_code = UPPER(SUBSTR(flight_number, 1, 2))"
+            " WHERE airline_code IS NULL AND flight_number IS NOT NULL"
+        ))
+        if result.rowcount:
+            print(f"Backfilled airline_code for {result.rowcount} flights")
+
+
+def backfill_seat_maps(bind):
+    """Build flights.seat_map from confirmed bookings for flights written before it existed"""
+    with bind.begin() as connection:
+        flight_ids = [row[0] for row in connection.execute(text("SELECT id FROM flights WHERE seat_map IS NULL"))]
+        if not flight_ids:
+            return
+        masks = dict.fromkeys(flight_ids, 0)
+        bookings = connection.execute(text(
+            "SELECT b.flight_id, b.seat_number FROM bookings b JOIN flights f ON f.id = b.flight_id"
+            " WHERE f.seat_map IS NULL AND b.booking_status = 'confirmed'"
+        ))
+        skipped = 0
+        for flight_id, seat_number in bookings:
+            try:
+                masks[flight_id] |= 1 << seat_index(seat_number or "")
+            except ValueError:
+                skipped += 1
+        connection.execute(
+            text("UPDATE flights SET seat_map = :seat_map WHERE id = :id"),
+            [{"id": flight_id, "seat_map": to_bytes(mask)} for flight_id, mask in masks.items()]
+        )
+        print(f"Backfilled seat_map for {len(flight_ids)} flights")
+        if skipped:
+            print(f"Skipped {skipped} bookings with seat numbers outside the cabin layout")
+
+
+def upgrade_schema(bind=None):
+    """Bring an existing database up to date with the models (idempotent)"""
+    bind = bind or get_engine()
+    Base.metadata.create_all(bind=bind)
+    add_missing_columns(bind)
+    backfill_departure_minutes(bind)
+    backfill_airline_codes(bind)
+    backfill_seat_maps(bind)
+    drop_stale_unique_indexes(bind)
+    create_missing_indexes(bind)
+
+
+def main():
+    upgrade_schema()
+    print("Schema upgraded.")
+
+if __name__ == '__main__':
+    main()
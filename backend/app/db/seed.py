@@ -1,8 +1,37 @@
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
+from app.models.airline import Airline
 from app.models.flight import Flight
 from app.models.user import User
 from app.core.security import get_password_hash
+from app.services.flight_loader import FlightLoader
+
+# Full names for the airline codes used across the seed scripts
+AIRLINE_NAMES = {
+    'AA': 'American Airlines',
+    'AB': 'Bonza',
+    'AF': 'Air France',
+    'AI': 'Air India',
+    'BA': 'British Airways',
+    'DL': 'Delta Air Lines',
+    'EK': 'Emirates',
+    'JL': 'Japan Airlines',
+    'JQ': 'Jetstar Airways',
+    'LH': 'Lufthansa',
+    'QF': 'Qantas',
+    'SQ': 'Singapore Airlines',
+    'TT': 'Tiger Airways Australia',
+    'UA': 'United Airlines',
+    'VA': 'Virgin Australia',
+    'ZL': 'Rex Airlines',
+}
+
+def seed_airlines(db: Session, names: dict = AIRLINE_NAMES):
+    # Upsert by code so scripts can register the airlines they introduce
+    for code, name in names.items():
+        db.merge(Airline(code=code, name=name))
+    db.commit()
+    print(f'Airlines seeded successfully! Registered {len(names)} airlines.')
 
 def seed_flights(db: Session):
     # Check if flights already exist
@@ -43,23 +72,24 @@ def seed_flights(db: Session):
                     # Create 1-3 flights per day between major city pairs
                     if (i < 5 and j < 5) or (day % 3 == 0):  # More flights between major cities
                         # Randomize departure times throughout the day
-                        for flight_time in range(0, 18, 6):  # Flights at 6am, 12pm, 6pm
+                        for slot, flight_time in enumerate(range(0, 18, 6)):  # Flights at 6am, 12pm, 6pm
                             departure_time = base_time + timedelta(hours=flight_time)
                             
                             # Flight duration based on distance (roughly)
                             # Longer flights for city pairs that are farther apart
                             duration_hours = 2 + ((i + j) % 10)  # Between 2-11 hours
                             
-                            # Generate flight number using airline code and numbers
+                            # Generate flight number using airline code and numbers; flight
+                            # numbers are unique, so each day's flight carries its date
                             airline = airlines[(i + j) % len(airlines)]
-                            flight_num = f'{airline}{100 + ((i * 10) + j)}'
+                            flight_num = f'{airline}{1000 + (i * 10 + j) * 3 + slot}-{departure_time:%y%m%d}'
                             
                             # Calculate price based on distance and add some randomization
                             base_price = 200 + (duration_hours * 100)  # Longer flights cost more
                             price_variation = (i + j + day) % 200  # Add some price variation
                             
                             # Create the flight
-                            flight = Flight(
+                            flight = dict(
                                 flight_number=flight_num,
                                 departure_city=cities[i]['name'],
                                 arrival_city=cities[j]['name'],
@@ -70,10 +100,12 @@ def seed_flights(db: Session):
                             )
                             sample_flights.append(flight)
 
-    # Add flights to database
-    db.add_all(sample_flights)
-    db.commit()
-    print(f'Flights seeded successfully! Added {len(sample_flights)} flights.')
+    # Bulk upsert by flight number; a repeated number would replace the earlier flight
+    if len({flight['flight_number'] for flight in sample_flights}) != len(sample_flights):
+        raise ValueError('Seed flights reuse a flight number')
+    report = FlightLoader(db).load_dicts(sample_flights)
+    print(f'Flights seeded successfully! Added {report["inserted"]} flights'
+          f' ({report["rows_per_second"]} rows/s).')
 
 def seed_users(db: Session):
     # Check if users already exist
@@ -1,27 +1,94 @@
-﻿import sys
+import time
+_IMPORT_STARTED = time.perf_counter()
+
+import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import api_router
-from app.api.endpoints import booking
-
-app = FastAPI(title="Airline Reservation System")
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["http://localhost:3000", "http://localhost:5173", "http://localhost:5174", "http://localhost:5177"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include routers
-app.include_router(api_router, prefix="/api")
-app.include_router(booking.router, prefix="/bookings", tags=["bookings"])
-
-@app.get("/")
-async def root():
-    return {"message": "Welcome to Airline"}
\ No newline at end of file
+from app.api.endpoints import auth, booking, users
+from app.core.config import settings
+from app.core.database import dispose_engines, warm_async_pool, warm_pool
+from app.db.migrate import upgrade_schema
+from app.services.background import run_periodically
+from app.services.hold_sweeper import sweep_expired_holds
+from app.services.rollups import refresh_rollups
+from app.services.schedule_service import extend_schedule_horizon
+from app.services.stats_counters import reconcile_stats_counters
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The background jobs and the queries below expect the current schema
+    # (rollup tables, seat maps, indexes), so bring the database up to date first
+    if settings.DB_UPGRADE_SCHEMA_ON_STARTUP:
+        try:
+            await asyncio.to_thread(upgrade_schema)
+        except Exception as e:
+            logger.error(f"Schema upgrade failed: {e}")
+    # The engines are created lazily; open connections now so the
+    # first requests after a cold start do not pay for them
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(
+            asyncio.to_thread(warm_pool),
+            warm_async_pool(settings.DB_POOL_WARM_CONNECTIONS)
+        )
+    except Exception as e:
+        # Don't crash, let the app start but log the error
+        logger.error(f"Database connection failed: {e}")
+    logger.info(f"Startup finished in {(time.perf_counter() - started) * 1000:.0f} ms (pool warm-up)")
+    jobs = [
+        asyncio.create_task(run_periodically(
+            lambda: sweep_expired_holds(settings.SEAT_HOLD_SWEEP_BATCH_SIZE),
+            settings.SEAT_HOLD_SWEEP_INTERVAL_SECONDS,
+            "Seat hold sweep"
+        )),
+        asyncio.create_task(run_periodically(
+            reconcile_stats_counters, settings.STATS_RECONCILE_INTERVAL_SECONDS, "Stats reconciliation"
+        )),
+        asyncio.create_task(run_periodically(
+            extend_schedule_horizon, settings.SCHEDULE_HORIZON_INTERVAL_SECONDS, "Schedule expansion"
+        )),
+        asyncio.create_task(run_periodically(
+            refresh_rollups, settings.ROLLUP_REFRESH_INTERVAL_SECONDS, "Rollup refresh"
+        )),
+    ]
+    yield
+    for job in jobs:
+        job.cancel()
+    await dispose_engines()
+
+def create_app() -> FastAPI:
+    app = FastAPI(title="Airline Reservation System", lifespan=lifespan)
+
+    # Configure CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["http://localhost:3000", "http://localhost:5173", "http://localhost:5174", "http://localhost:5177"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Include routers
+    app.include_router(api_router, prefix="/api")
+    app.include_router(booking.router, prefix="/bookings", tags=["bookings"])
+    app.include_router(auth.router, prefix="/auth", tags=["auth"])
+    app.include_router(users.router, prefix="/users", tags=["users"])
+
+    @app.get("/")
+    async def root():
+        return {"message": "Welcome to Airline"}
+
+    return app
+
+app = create_app()
+logger.info(f"App imported in {(time.perf_counter() - _IMPORT_STARTED) * 1000:.0f} ms")
@@ -1,4 +1,8 @@
 # Import all models to make them available to SQLAlchemy
 from .user import User
 from .flight import Flight
-from .booking import Booking
\ No newline at end of file
+from .booking import Booking
+from .airline import Airline
+from .seat_hold import SeatHold
+from .rollup import RouteDailyRollup, BookingDailyRollup, RollupWatermark, RollupStaleDate
+from .schedule import FlightSchedule, ScheduleOverride
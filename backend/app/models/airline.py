@@ -0,0 +1,8 @@
+from sqlalchemy import Column, String
+from ..core.database import Base
+
+class Airline(Base):
+    __tablename__ = "airlines"
+
+    code = Column(String(3), primary_key=True)  # IATA designator, matches Flight.airline_code
+    name = Column(String, nullable=False)
@@ -1,15 +1,28 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
 
 class Booking(Base):
     __tablename__ = "bookings"
+    __table_args__ = (
+        # A seat can be sold once per flight; enforced by the database so
+        # concurrent bookings cannot both confirm it
+        Index(
+            "uq_bookings_confirmed_seat", "flight_id", "seat_number", unique=True,
+            postgresql_where=text("booking_status = 'confirmed'"),
+            sqlite_where=text("booking_status = 'confirmed'")
+        ),
+        # Seat and status lookups per flight for any status, answered from the index alone
+        Index("ix_bookings_flight_status_seat", "flight_id", "booking_status", "seat_number"),
+        # A user's bookings, newest first (keyset paginated on created_at, id)
+        Index("ix_bookings_user_created", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     flight_id = Column(Integer, ForeignKey("flights.id"))
-    booking_reference = Column(String, unique=True, index=True)
+    booking_reference = Column(String, index=True)  # Shared by the seats of one multi-seat booking
     seat_number = Column(String)  # For multi-seat bookings, one row per seat
     booking_status = Column(String)  # confirmed, cancelled, pending
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,9 +1,20 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Index, LargeBinary, event
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
 class Flight(Base):
     __tablename__ = "flights"
+    __table_args__ = (
+        # Serves the (departure_time, id) ordering used by keyset pagination
+        Index("ix_flights_departure_time_id", "departure_time", "id"),
+        # Route + date range, with the time of day available for index-only filtering
+        Index(
+            "ix_flights_route_departure",
+            "departure_city", "arrival_city", "departure_time", "departure_minute"
+        ),
+        # At most one flight per schedule and service date
+        Index("uq_flights_schedule_service_date", "schedule_id", "service_date", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     flight_number = Column(String, unique=True, index=True)
@@ -13,6 +24,28 @@ class Flight(Base):
     arrival_time = Column(DateTime, nullable=False)
     price = Column(Float, nullable=False, index=True)  # Index for faster price filtering
     available_seats = Column(Integer, nullable=False)
-    
+    departure_minute = Column(Integer, index=True)  # Minutes after midnight, derived from departure_time
+    airline_code = Column(String(3), index=True)  # e.g. 'QF' for QF286, derived from flight_number
+    seat_map = Column(LargeBinary, default=b"")  # Bitmap of confirmed seats, see services/seat_map.py
+    # Set on flights expanded from a FlightSchedule
+    schedule_id = Column(Integer, ForeignKey("flight_schedules.id", ondelete="SET NULL"))
+    service_date = Column(Date)
+
     # Relationships - add cascade delete
-    bookings = relationship("Booking", back_populates="flight", cascade="all, delete-orphan")
\ No newline at end of file
+    bookings = relationship("Booking", back_populates="flight", cascade="all, delete-orphan")
+
+
+def minute_of_day(value) -> int:
+    return value.hour * 60 + value.minute
+
+def airline_code_for(flight_number: str) -> str:
+    return flight_number[:2].upper()
+
+@event.listens_for(Flight, "before_insert")
+@event.listens_for(Flight, "before_update")
+def _sync_derived_columns(mapper, connection, target):
+    """Keep denormalized search columns consistent with their source columns"""
+    if target.departure_time is not None:
+        target.departure_minute = minute_of_day(target.departure_time)
+    if target.flight_number:
+        target.airline_code = airline_code_for(target.flight_number)
@@ -0,0 +1,90 @@
+from datetime import date
+from typing import Iterable
+
+from sqlalchemy import Column, Integer, String, Float, Date, UniqueConstraint, event, inspect
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from ..core.database import Base
+from .flight import Flight
+
+# Dashboard analytics, maintained by services/rollups.py. The endpoints under
+# /api/stats/timeseries read only these tables, never flights or bookings.
+
+class RouteDailyRollup(Base):
+    """Flights and seats by departure date, route and airline"""
+    __tablename__ = "route_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("service_date", "departure_city", "arrival_city", "airline_code",
+                         name="uq_route_daily_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    service_date = Column(Date, nullable=False, index=True)
+    departure_city = Column(String, nullable=False)
+    arrival_city = Column(String, nullable=False)
+    airline_code = Column(String(3), nullable=False)  # '' for flights without one
+    flights = Column(Integer, nullable=False, default=0)
+    seats_sold = Column(Integer, nullable=False, default=0)
+    seats_available = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)  # Confirmed seats at the current fare
+
+
+class BookingDailyRollup(Base):
+    """Confirmed seats sold by booking date (UTC), route and airline"""
+    __tablename__ = "booking_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("booking_date", "departure_city", "arrival_city", "airline_code",
+                         name="uq_booking_daily_rollups_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    booking_date = Column(Date, nullable=False, index=True)
+    departure_city = Column(String, nullable=False)
+    arrival_city = Column(String, nullable=False)
+    airline_code = Column(String(3), nullable=False)
+    bookings = Column(Integer, nullable=False, default=0)
+    revenue = Column(Float, nullable=False, default=0)  # Fare when the booking was rolled up
+
+
+class RollupWatermark(Base):
+    """Progress of an incremental rollup job, e.g. the last booking id it has counted"""
+    __tablename__ = "rollup_watermarks"
+
+    name = Column(String, primary_key=True)
+    last_id = Column(Integer, nullable=False, default=0)
+
+
+class RollupStaleDate(Base):
+    """
+    A departure date whose route rollups must be recomputed, recorded in the
+    same transaction as the flight or seat change, so it survives restarts
+    and is seen whichever process made the change
+    """
+    __tablename__ = "rollup_stale_dates"
+
+    service_date = Column(Date, primary_key=True)
+
+
+def mark_stale_dates(connection, dates: Iterable[date]):
+    """Record departure dates for the rollup job; `connection` is a Session or Connection"""
+    dates = sorted(set(dates))
+    if not dates:
+        return
+    dialect = connection.get_bind().dialect if isinstance(connection, Session) else connection.dialect
+    dialect_insert = postgresql_insert if dialect.name == "postgresql" else sqlite_insert
+    connection.execute(
+        dialect_insert(RollupStaleDate).values([{"service_date": day} for day in dates]).on_conflict_do_nothing()
+    )
+
+
+@event.listens_for(Flight, "after_insert")
+@event.listens_for(Flight, "after_update")
+@event.listens_for(Flight, "after_delete")
+def _flight_written(mapper, connection, target):
+    """Every ORM flight write marks its departure date, and the old one if it moved"""
+    moved_from = inspect(target).attrs.departure_time.history.deleted or ()
+    mark_stale_dates(
+        connection,
+        [departure.date() for departure in (target.departure_time, *moved_from) if departure is not None]
+    )
@@ -0,0 +1,43 @@
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, Time, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy.orm import relationship
+from datetime import datetime
+from ..core.database import Base
+
+class FlightSchedule(Base):
+    """
+    A recurring departure. Flights are expanded from it per service date by
+    services/schedule_service.py, a rolling horizon ahead.
+    """
+    __tablename__ = "flight_schedules"
+
+    id = Column(Integer, primary_key=True, index=True)
+    flight_number = Column(String, nullable=False, index=True)  # Instances are numbered e.g. QF400-261201
+    departure_city = Column(String, nullable=False)
+    arrival_city = Column(String, nullable=False)
+    days_of_week = Column(String(7), nullable=False)  # ISO weekdays flown, e.g. '135' for Mon/Wed/Fri
+    departure_time = Column(Time, nullable=False)  # Local time of day, like Flight.departure_time
+    duration_minutes = Column(Integer, nullable=False)
+    valid_from = Column(Date, nullable=False)
+    valid_until = Column(Date, nullable=False)
+    price = Column(Float, nullable=False)
+    capacity = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    overrides = relationship("ScheduleOverride", back_populates="schedule", cascade="all, delete-orphan")
+
+
+class ScheduleOverride(Base):
+    """A change to one service date of a schedule, applied when that date is expanded"""
+    __tablename__ = "schedule_overrides"
+    __table_args__ = (
+        UniqueConstraint("schedule_id", "service_date", name="uq_schedule_overrides_date"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    schedule_id = Column(Integer, ForeignKey("flight_schedules.id", ondelete="CASCADE"), nullable=False)
+    service_date = Column(Date, nullable=False)
+    cancelled = Column(Boolean, nullable=False, default=False)
+    price = Column(Float)  # None keeps the schedule's
+    capacity = Column(Integer)
+
+    schedule = relationship("FlightSchedule", back_populates="overrides")
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from datetime import datetime
+from ..core.database import Base
+
+class SeatHold(Base):
+    __tablename__ = "seat_holds"
+
+    id = Column(Integer, primary_key=True, index=True)
+    hold_token = Column(String, unique=True, index=True, nullable=False)
+    flight_id = Column(Integer, ForeignKey("flights.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    seat_numbers = Column(String, nullable=False)  # Comma-separated canonical seat labels, e.g. '12A,12B'
+    expires_at = Column(DateTime, nullable=False, index=True)  # Swept by services/hold_sweeper.py
+    created_at = Column(DateTime, default=datetime.utcnow)
@@ -1,4 +1,6 @@
-from .flight import Flight, FlightCreate, FlightUpdate
-from .booking import Booking, BookingCreate, BookingUpdate
+from .flight import Flight, FlightCreate, FlightUpdate, FlightPage, Itinerary, FareDay
+from .booking import Booking, BookingCreate, BookingUpdate, SeatHold, SeatHoldCreate
 from .user import User, UserCreate, UserUpdate
-from .token import Token, TokenData, TokenPayload
\ No newline at end of file
+from .token import Token, TokenData, TokenPayload
+from .airline import Airline
+from .schedule import FlightSchedule, FlightScheduleCreate, FlightScheduleUpdate, ScheduleOverride, ScheduleOverrideCreate
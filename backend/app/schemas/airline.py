@@ -0,0 +1,9 @@
+from pydantic import BaseModel
+from typing import Optional
+
+class Airline(BaseModel):
+    code: str
+    name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
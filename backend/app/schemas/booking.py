@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 class BookingBase(BaseModel):
     user_id: int
@@ -16,6 +16,18 @@ class BookingCreateMulti(BaseModel):
     flight_id: int
     booking_reference: str
     seat_numbers: List[str]
+    hold_token: Optional[str] = None  # Confirms these seats from an active seat hold
+
+class SeatHoldCreate(BaseModel):
+    flight_id: int
+    seat_numbers: List[str]
+    user_id: Optional[int] = None
+
+class SeatHold(BaseModel):
+    hold_token: str
+    flight_id: int
+    seat_numbers: List[str]
+    expires_at: datetime
 
 class BookingUpdate(BaseModel):
     user_id: Optional[int] = None
@@ -25,9 +37,22 @@ class BookingUpdate(BaseModel):
 
 class Booking(BookingBase):
     id: int
+    booking_reference: Optional[str] = None
+    booking_status: Optional[str] = None
 
     class Config:
         from_attributes = True
 
 class BookingMulti(BaseModel):
-    bookings: List[Booking]
\ No newline at end of file
+    bookings: List[Booking]
+
+class BookingPage(BaseModel):
+    items: List[Booking]
+    next_cursor: Optional[str] = None  # Pass back as `cursor` for the next (older) page
+
+class SeatMap(BaseModel):
+    flight_id: int
+    seat_letters: str  # Seats per row; seat '{row}{letter}' is bit (row - 1) * len(seat_letters) + letter index
+    booked_count: int
+    bitmap: str  # Base64 of the little-endian seat bitmap
+    runs: List[Tuple[int, int]]  # (first seat index, length) for each block of booked seats
\ No newline at end of file
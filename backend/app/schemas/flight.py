@@ -1,6 +1,6 @@
 from pydantic import BaseModel
-from datetime import datetime
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 class FlightBase(BaseModel):
     flight_number: str
@@ -27,4 +27,21 @@ class Flight(FlightBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FlightPage(BaseModel):
+    items: List[Flight]
+    next_cursor: Optional[str] = None
+
+class Itinerary(BaseModel):
+    legs: List[Flight]
+    stops: int
+    total_price: float
+    total_duration_minutes: int
+    departure_time: datetime
+    arrival_time: datetime
+
+class FareDay(BaseModel):
+    date: date
+    min_price: Optional[float] = None
+    flight_count: int
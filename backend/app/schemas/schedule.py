@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field
+from datetime import date, datetime, time
+from typing import Optional
+
+class FlightScheduleBase(BaseModel):
+    flight_number: str
+    departure_city: str
+    arrival_city: str
+    days_of_week: str = Field("1234567", pattern="^[1-7]{1,7}$")  # ISO weekdays, Monday = 1
+    departure_time: time
+    duration_minutes: int = Field(..., gt=0)
+    valid_from: date
+    valid_until: date
+    price: float = Field(..., ge=0)
+    capacity: int = Field(..., ge=0)
+
+class FlightScheduleCreate(FlightScheduleBase):
+    pass
+
+class FlightScheduleUpdate(BaseModel):
+    days_of_week: Optional[str] = Field(None, pattern="^[1-7]{1,7}$")
+    departure_time: Optional[time] = None
+    duration_minutes: Optional[int] = Field(None, gt=0)
+    valid_from: Optional[date] = None
+    valid_until: Optional[date] = None
+    price: Optional[float] = Field(None, ge=0)
+    capacity: Optional[int] = Field(None, ge=0)
+
+class FlightSchedule(FlightScheduleBase):
+    id: int
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ScheduleOverrideCreate(BaseModel):
+    service_date: date
+    cancelled: bool = False
+    price: Optional[float] = Field(None, ge=0)
+    capacity: Optional[int] = Field(None, ge=0)
+
+class ScheduleOverride(ScheduleOverrideCreate):
+    id: int
+    schedule_id: int
+
+    class Config:
+        from_attributes = True
@@ -5,7 +5,6 @@ class UserBase(BaseModel):
     email: EmailStr
     username: str
     full_name: Optional[str] = None
-    is_admin: bool = False
 
 class UserCreate(UserBase):
     password: str
@@ -18,6 +17,7 @@ class UserUpdate(BaseModel):
 
 class User(UserBase):
     id: int
+    is_admin: bool = False
 
     class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,119 @@
+from typing import Optional
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError, jwt
+from sqlalchemy import or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import get_db
+from ..models.user import User
+from .password_hasher import password_hasher
+from .principal_cache import Principal, principal_cache
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
+
+_credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
+
+
+class AuthService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        return self.db.get(User, user_id)
+
+    def get_user_by_username(self, username: str) -> Optional[User]:
+        return self.db.query(User).filter(User.username == username).first()
+
+    def create_user(
+        self,
+        email: str,
+        username: str,
+        hashed_password: str,
+        full_name: Optional[str] = None,
+        is_admin: bool = False
+    ) -> User:
+        """hashed_password comes from password_hasher, which keeps bcrypt off the event loop"""
+        taken = self.db.query(User.id).filter(or_(User.email == email, User.username == username)).first()
+        if taken is not None:
+            raise HTTPException(status_code=400, detail="Username or email already registered")
+        user = User(
+            email=email,
+            username=username,
+            hashed_password=hashed_password,
+            full_name=full_name,
+            is_admin=is_admin
+        )
+        self.db.add(user)
+        self.db.commit()
+        self.db.refresh(user)
+        return user
+
+    def get_login_user(self, username: str) -> Optional[User]:
+        """The user signing in with a username or email"""
+        return self.db.query(User).filter(or_(User.username == username, User.email == username)).first()
+
+    def update_password_hash(self, user_id: int, hashed_password: str):
+        self.db.execute(update(User).where(User.id == user_id).values(hashed_password=hashed_password))
+        self.db.commit()
+
+    def resolve_token(self, token: str) -> Principal:
+        """Validate an access token and load its user; raises 401 on any failure"""
+        try:
+            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        except JWTError:
+            raise _credentials_exception
+        user_id = payload.get("id")
+        if user_id is not None:
+            user = self.get_user(user_id)
+        elif payload.get("sub"):
+            user = self.get_user_by_username(payload["sub"])
+        else:
+            raise _credentials_exception
+        if user is None or not user.is_active:
+            raise _credentials_exception
+        principal = Principal.from_user(user)
+        principal_cache.put(token, principal, payload.get("exp"))
+        return principal
+
+
+async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+    """
+    The user for a username (or email) and password, or None. bcrypt runs on
+    the password hasher's pool; a hash made with an outdated cost is
+    replaced by one made with PASSWORD_HASH_ROUNDS.
+    """
+    user = await db.run_sync(lambda session: AuthService(session).get_login_user(username))
+    if user is None or not user.is_active:
+        return None
+    verified, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+    if not verified:
+        return None
+    if new_hash is not None:
+        await db.run_sync(lambda session: AuthService(session).update_password_hash(user.id, new_hash))
+    return user
+
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> Principal:
+    """
+    The authenticated user. Served from the principal cache when the token
+    was seen recently, without touching the database (the session is only
+    connected on a miss).
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    return AuthService(db).resolve_token(token)
+
+
+def get_current_admin_user(current_user: Principal = Depends(get_current_user)) -> Principal:
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin privileges required")
+    return current_user
@@ -0,0 +1,15 @@
+import asyncio
+import logging
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+async def run_periodically(job: Callable[[], object], interval_seconds: float, name: str):
+    """Run a blocking job on a worker thread every `interval_seconds` until cancelled"""
+    while True:
+        try:
+            await asyncio.to_thread(job)
+        except Exception as e:
+            logger.error(f"{name} failed: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,305 @@
+import base64
+import secrets
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, delete, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.booking import Booking
+from ..models.flight import Flight
+from ..models.rollup import mark_stale_dates
+from ..models.seat_hold import SeatHold
+from ..schemas.booking import BookingCreateMulti, SeatHoldCreate
+from . import seat_map
+from .flight_index import FlightRecord
+from .flight_service import FLIGHT_COLUMNS, FlightService, decode_cursor, encode_cursor
+from .stats_counters import stats_counters
+
+
+# Response columns of the Booking schema; the model keeps the booking date as created_at
+BOOKING_COLUMNS = (
+    Booking.id,
+    Booking.user_id,
+    Booking.flight_id,
+    Booking.seat_number,
+    Booking.booking_reference,
+    Booking.booking_status,
+    Booking.created_at.label("booking_date"),
+)
+
+
+class BookingService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_seat_mask(self, flight_id: int) -> Optional[int]:
+        """The flight's booked-seat bitmap in one primary-key lookup; None if there is no such flight"""
+        row = self.db.query(Flight.seat_map).filter(Flight.id == flight_id).first()
+        if row is None:
+            return None
+        if row.seat_map is None:
+            # Not backfilled yet (see db/migrate.py)
+            return seat_map.seat_mask_from_bookings(self.db, flight_id)
+        return seat_map.from_bytes(row.seat_map)
+
+    def get_booked_seats(self, flight_id: int) -> List[str]:
+        mask = self.get_seat_mask(flight_id)
+        if mask is None:
+            raise HTTPException(status_code=404, detail="Flight not found")
+        return seat_map.seat_labels(mask)
+
+    def get_seat_map(self, flight_id: int) -> dict:
+        mask = self.get_seat_mask(flight_id)
+        if mask is None:
+            raise HTTPException(status_code=404, detail="Flight not found")
+        return {
+            "flight_id": flight_id,
+            "seat_letters": seat_map.SEAT_LETTERS,
+            "booked_count": bin(mask).count("1"),
+            "bitmap": base64.b64encode(seat_map.to_bytes(mask)).decode(),
+            "runs": seat_map.seat_runs(mask),
+        }
+
+    def get_user_bookings(self, user_id: int, limit: int = 20, cursor: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+        """
+        A user's bookings newest first, one keyset page at a time. Served by
+        ix_bookings_user_created without sorting; raises ValueError for a bad cursor.
+        """
+        query = self.db.query(*BOOKING_COLUMNS).filter(Booking.user_id == user_id)
+        if cursor:
+            before_time, before_id = decode_cursor(cursor)
+            query = query.filter(
+                or_(
+                    Booking.created_at < before_time,
+                    and_(Booking.created_at == before_time, Booking.id < before_id)
+                )
+            )
+        rows = query.order_by(Booking.created_at.desc(), Booking.id.desc()).limit(limit + 1).all()
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].booking_date, rows[-1].id)
+        return [row._asdict() for row in rows], next_cursor
+
+    def create_bookings(self, booking: BookingCreateMulti) -> List[dict]:
+        """
+        Book every requested seat or none, safe under concurrent requests.
+
+        Without a hold token the seats are taken by _take_seats(); with one,
+        the hold is claimed instead and its seats are already taken. The
+        unique index on confirmed (flight_id, seat_number) is the final guard.
+
+        All seats are inserted by one INSERT ... RETURNING, and the response
+        rows are built from what it returns, so an N-seat booking costs the
+        same number of round trips as a single seat.
+        """
+        requested, count = self._parse_seats(booking.seat_numbers)
+        seats = [seat_map.seat_label(seat_map.seat_index(seat)) for seat in booking.seat_numbers]
+        now = datetime.utcnow()
+        try:
+            if booking.hold_token is None:
+                flight = self._take_seats(booking.flight_id, requested, count)
+            else:
+                flight = None
+                self._claim_hold(booking.hold_token, booking.flight_id, requested)
+
+            # One row per seat, in a single statement
+            inserted = self.db.execute(
+                insert(Booking)
+                .values([
+                    {
+                        "user_id": booking.user_id,
+                        "flight_id": booking.flight_id,
+                        "booking_reference": booking.booking_reference,
+                        "seat_number": seat,
+                        "booking_status": "confirmed",
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for seat in seats
+                ])
+                .returning(Booking.id, Booking.seat_number, Booking.created_at)
+            ).all()
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()
+            raise HTTPException(status_code=409, detail="Seats already booked")
+
+        stats_counters.bookings_created(len(inserted))
+        if flight is not None:
+            self._seats_changed(flight, -count)
+        # RETURNING order is not guaranteed to follow VALUES order
+        by_seat = {row.seat_number: row for row in inserted}
+        return [
+            {
+                "id": by_seat[seat].id,
+                "user_id": booking.user_id,
+                "flight_id": booking.flight_id,
+                "seat_number": seat,
+                "booking_date": by_seat[seat].created_at,
+                "booking_reference": booking.booking_reference,
+                "booking_status": "confirmed",
+            }
+            for seat in seats
+        ]
+
+    def hold_seats(self, hold: SeatHoldCreate) -> dict:
+        """Take seats for SEAT_HOLD_TTL_SECONDS; confirm with create_bookings(hold_token=...)"""
+        requested, count = self._parse_seats(hold.seat_numbers)
+        expires_at = datetime.utcnow() + timedelta(seconds=settings.SEAT_HOLD_TTL_SECONDS)
+        labels = seat_map.seat_labels(requested)
+        token = secrets.token_urlsafe(16)
+        flight = self._take_seats(hold.flight_id, requested, count)
+        self.db.add(SeatHold(
+            hold_token=token,
+            flight_id=hold.flight_id,
+            user_id=hold.user_id,
+            seat_numbers=",".join(labels),
+            expires_at=expires_at
+        ))
+        self.db.commit()
+        self._seats_changed(flight, -count)
+        return {"hold_token": token, "flight_id": hold.flight_id, "seat_numbers": labels, "expires_at": expires_at}
+
+    def release_hold(self, hold_token: str) -> bool:
+        released = self.db.execute(
+            delete(SeatHold).where(SeatHold.hold_token == hold_token)
+            .returning(SeatHold.flight_id, SeatHold.seat_numbers)
+        ).first()
+        if released is None:
+            self.db.rollback()
+            return False
+        mask = seat_map.seat_mask(released.seat_numbers.split(","))
+        flight = self._release_seats(released.flight_id, mask)
+        self.db.commit()
+        if flight is not None:
+            self._seats_changed(flight, bin(mask).count("1"))
+        return True
+
+    def sweep_expired_holds(self, batch_size: int) -> int:
+        """
+        Release up to `batch_size` expired holds in one transaction and
+        return how many were released; seats are returned with one UPDATE
+        per flight rather than one per hold.
+        """
+        expired = (
+            select(SeatHold.id)
+            .where(SeatHold.expires_at <= datetime.utcnow())
+            .order_by(SeatHold.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        ids = self.db.execute(expired).scalars().all()
+        if not ids:
+            self.db.rollback()
+            return 0
+        # Holds confirmed or released since the select are no longer returned here
+        released = self.db.execute(
+            delete(SeatHold).where(SeatHold.id.in_(ids))
+            .returning(SeatHold.flight_id, SeatHold.seat_numbers)
+        ).all()
+        masks = {}
+        for flight_id, seat_numbers in released:
+            masks[flight_id] = masks.get(flight_id, 0) | seat_map.seat_mask(seat_numbers.split(","))
+        # Lock flights in id order so concurrent sweepers cannot deadlock
+        flights = [self._release_seats(flight_id, masks[flight_id]) for flight_id in sorted(masks)]
+        self.db.commit()
+        for flight in flights:
+            if flight is not None:
+                self._seats_changed(flight, bin(masks[flight.id]).count("1"))
+        return len(released)
+
+    def _parse_seats(self, seat_numbers: List[str]) -> Tuple[int, int]:
+        try:
+            requested = seat_map.seat_mask(seat_numbers)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        count = len(seat_numbers)
+        if bin(requested).count("1") != count:
+            raise HTTPException(status_code=400, detail="Duplicate seat numbers")
+        return requested, count
+
+    def _take_seats(self, flight_id: int, requested: int, count: int) -> FlightRecord:
+        """
+        Take seats in the current transaction or roll back and raise; returns
+        the updated flight.
+
+        The seat count is taken by a conditional UPDATE that only matches while
+        enough seats remain; it also locks the flight row until commit, so the
+        seat bitmap read back from it is current for the conflict check.
+        """
+        taken = self.db.execute(
+            update(Flight)
+            .where(Flight.id == flight_id, Flight.available_seats >= count)
+            .values(available_seats=Flight.available_seats - count)
+            .returning(Flight.seat_map, *FLIGHT_COLUMNS)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if taken is None:
+            self.db.rollback()
+            if self.db.query(Flight.id).filter(Flight.id == flight_id).first() is None:
+                raise HTTPException(status_code=404, detail="Flight not found")
+            raise HTTPException(status_code=400, detail="Not enough available seats")
+
+        booked = seat_map.from_bytes(taken.seat_map) if taken.seat_map is not None \
+            else seat_map.seat_mask_from_bookings(self.db, flight_id)
+        conflicts = requested & booked
+        if conflicts:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail=f"Seats already booked: {', '.join(seat_map.seat_labels(conflicts))}"
+            )
+        self._write_seat_map(flight_id, booked | requested)
+        mark_stale_dates(self.db, [taken.departure_time.date()])
+        return FlightRecord.from_flight(taken)
+
+    def _release_seats(self, flight_id: int, mask: int) -> Optional[FlightRecord]:
+        """Return held seats to the flight, in the current transaction; returns the updated flight"""
+        row = self.db.execute(
+            update(Flight)
+            .where(Flight.id == flight_id)
+            .values(available_seats=Flight.available_seats + bin(mask).count("1"))
+            .returning(Flight.seat_map, *FLIGHT_COLUMNS)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            return None
+        self._write_seat_map(flight_id, seat_map.from_bytes(row.seat_map) & ~mask)
+        mark_stale_dates(self.db, [row.departure_time.date()])
+        return FlightRecord.from_flight(row)
+
+    def _write_seat_map(self, flight_id: int, mask: int):
+        self.db.execute(
+            update(Flight)
+            .where(Flight.id == flight_id)
+            .values(seat_map=seat_map.to_bytes(mask))
+            .execution_options(synchronize_session=False)
+        )
+
+    def _claim_hold(self, hold_token: str, flight_id: int, requested: int):
+        """Consume an unexpired hold covering exactly the requested seats, or roll back and raise"""
+        hold = self.db.execute(
+            delete(SeatHold)
+            .where(
+                SeatHold.hold_token == hold_token,
+                SeatHold.flight_id == flight_id,
+                SeatHold.expires_at > datetime.utcnow()
+            )
+            .returning(SeatHold.seat_numbers)
+        ).first()
+        if hold is None:
+            self.db.rollback()
+            raise HTTPException(status_code=410, detail="Seat hold not found or expired")
+        if seat_map.seat_mask(hold.seat_numbers.split(",")) != requested:
+            self.db.rollback()
+            raise HTTPException(status_code=409, detail="Seats do not match the seat hold")
+
+    def _seats_changed(self, after: FlightRecord, delta: int):
+        """Report a committed seat-count change to the flight read caches"""
+        before = after._replace(available_seats=after.available_seats - delta)
+        FlightService(self.db).flight_written(before, after)
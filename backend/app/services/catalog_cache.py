@@ -0,0 +1,169 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from ..core.config import settings
+from .flight_index import FlightRecord
+
+# Price bounds are kept globally (key None) and per (departure_city, arrival_city)
+BoundsKey = Optional[Tuple[str, str]]
+Bounds = Tuple[Optional[float], Optional[float]]
+# Fare calendars are cached per (route, start_date, days)
+CalendarKey = Tuple[Tuple[str, str], date, int]
+
+
+def _catalog_fields(record: FlightRecord):
+    # Everything the cached aggregates depend on; a seat-count change (a booking) touches none
+    return record.departure_city, record.arrival_city, record.departure_time, record.price, record.airline_code
+
+
+class CatalogCache:
+    """
+    Process-local cache of small catalog-wide aggregates derived from the
+    flights table. FlightService reports every write through flight_written(),
+    which updates entries in place where it can and otherwise drops them so
+    the next read rebuilds lazily. Writes made by other processes are not
+    reported, so everything is also dropped whenever the ttl_seconds epoch
+    rolls over, the same epoch the flight ETags carry.
+    """
+
+    def __init__(self, max_calendars: int = 1024, ttl_seconds: int = 300):
+        self.max_calendars = max_calendars
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._epoch = self.epoch()
+        # Bumped on every write so a rebuild that raced with a write is not stored;
+        # doubles as the catalog version behind the flight ETags
+        self._generation = 0
+        self._last_modified = datetime.now(timezone.utc)
+        self._airline_codes: Optional[Set[str]] = None
+        self._price_bounds: Dict[BoundsKey, Bounds] = {}
+        self._fare_calendars: "OrderedDict[CalendarKey, List[dict]]" = OrderedDict()
+
+    @property
+    def version(self) -> int:
+        return self._generation
+
+    def epoch(self) -> int:
+        """Index of the current ttl_seconds interval (always 0 when the TTL is disabled)"""
+        return int(time.time() // self.ttl_seconds) if self.ttl_seconds else 0
+
+    def _expire(self):
+        epoch = self.epoch()
+        if epoch != self._epoch:
+            with self._lock:
+                if epoch != self._epoch:
+                    self._epoch = epoch
+                    self._drop()
+
+    @property
+    def last_modified(self) -> datetime:
+        """Time of the last flight write seen by this process (or of its start)"""
+        return self._last_modified
+
+    def get_airline_codes(self, loader: Callable[[], Iterable[str]]) -> List[str]:
+        self._expire()
+        codes = self._airline_codes
+        if codes is None:
+            generation = self._generation
+            codes = set(code for code in loader() if code)
+            with self._lock:
+                if generation == self._generation:
+                    self._airline_codes = codes
+        with self._lock:
+            return sorted(codes)
+
+    def get_price_bounds(self, key: BoundsKey, loader: Callable[[], Bounds]) -> Bounds:
+        """(min, max) price for the catalog (key=None) or one route; (None, None) if empty"""
+        self._expire()
+        bounds = self._price_bounds.get(key)
+        if bounds is None:
+            generation = self._generation
+            bounds = loader()
+            with self._lock:
+                if generation == self._generation:
+                    self._price_bounds[key] = bounds
+        return bounds
+
+    def get_fare_calendar(self, key: CalendarKey, loader: Callable[[], List[dict]]) -> List[dict]:
+        """Least-recently-used cache of fare calendars, dropped per route on flight writes"""
+        self._expire()
+        with self._lock:
+            calendar = self._fare_calendars.get(key)
+            if calendar is not None:
+                self._fare_calendars.move_to_end(key)
+                return calendar
+            generation = self._generation
+        calendar = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._fare_calendars[key] = calendar
+                while len(self._fare_calendars) > self.max_calendars:
+                    self._fare_calendars.popitem(last=False)
+        return calendar
+
+    def flight_written(self, before: Optional[FlightRecord], after: Optional[FlightRecord]):
+        """Apply a flight insert (before=None), update, or delete (after=None)"""
+        with self._lock:
+            self._generation += 1
+            self._last_modified = datetime.now(timezone.utc)
+            if before is not None and after is not None and _catalog_fields(before) == _catalog_fields(after):
+                return
+            if self._airline_codes is not None:
+                if before is None and after is not None:
+                    self._airline_codes.add(after.airline_code)
+                elif before is None or after is None or before.airline_code != after.airline_code:
+                    # The old code may have been its airline's last flight
+                    self._airline_codes = None
+            if before is not None:
+                self._remove_price(None, before.price)
+                self._remove_price((before.departure_city, before.arrival_city), before.price)
+            if after is not None:
+                self._add_price(None, after.price)
+                self._add_price((after.departure_city, after.arrival_city), after.price)
+            routes = {
+                (record.departure_city, record.arrival_city)
+                for record in (before, after) if record is not None
+            }
+            for key in [key for key in self._fare_calendars if key[0] in routes]:
+                del self._fare_calendars[key]
+
+    def _add_price(self, key: BoundsKey, price: float):
+        bounds = self._price_bounds.get(key)
+        if bounds is None:
+            return
+        low, high = bounds
+        self._price_bounds[key] = (
+            price if low is None else min(low, price),
+            price if high is None else max(high, price),
+        )
+
+    def _remove_price(self, key: BoundsKey, price: float):
+        bounds = self._price_bounds.get(key)
+        if bounds is None:
+            return
+        low, high = bounds
+        # Removing a price strictly inside the bounds cannot move them;
+        # removing an extreme needs a rescan, done lazily on the next read
+        if price == low or price == high:
+            del self._price_bounds[key]
+
+    def clear(self):
+        with self._lock:
+            self._last_modified = datetime.now(timezone.utc)
+            self._drop()
+
+    def _drop(self):
+        # Bumping the generation also stops a rebuild started before the drop from being stored
+        self._generation += 1
+        self._airline_codes = None
+        self._price_bounds = {}
+        self._fare_calendars.clear()
+
+
+catalog_cache = CatalogCache(
+    max_calendars=settings.FARE_CALENDAR_CACHE_SIZE,
+    ttl_seconds=settings.CATALOG_ETAG_TTL_SECONDS
+)
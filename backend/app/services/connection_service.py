@@ -0,0 +1,151 @@
+import asyncio
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from itertools import count
+from typing import List
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.flight import Flight
+from .flight_index import FlightRecord, FlightSearchIndex, flight_index
+
+# Connection searches are CPU-bound; running them here keeps the event loop
+# free to serve other requests while a deep search is in progress.
+connection_executor = ThreadPoolExecutor(
+    max_workers=settings.CONNECTION_SEARCH_WORKERS,
+    thread_name_prefix="connections"
+)
+# Upper bound on one leg's flight time, used to size the window of flights
+# loaded for a search when the shared flight index is disabled
+MAX_LEG_DURATION = timedelta(hours=24)
+
+
+def _itinerary(legs: List[FlightRecord]) -> dict:
+    first, last = legs[0], legs[-1]
+    return {
+        'legs': legs,
+        'stops': len(legs) - 1,
+        'total_price': round(sum(leg.price for leg in legs), 2),
+        'total_duration_minutes': int((last.arrival_time - first.departure_time).total_seconds() // 60),
+        'departure_time': first.departure_time,
+        'arrival_time': last.arrival_time,
+    }
+
+
+def find_connections(
+    index: FlightSearchIndex,
+    departure_city: str,
+    arrival_city: str,
+    start: datetime,
+    end: datetime,
+    max_stops: int = 1,
+    min_layover: timedelta = timedelta(minutes=45),
+    max_layover: timedelta = timedelta(hours=6),
+    sort_by: str = "price",
+    travelers: int = 1,
+    limit: int = 20
+) -> List[dict]:
+    """
+    Depth-first search over the time-expanded route graph held by the index.
+
+    Each leg only considers flights departing within [min_layover, max_layover]
+    of the previous arrival, found by bisect range scans. Price and elapsed
+    time only grow along a path, so partial itineraries that are already worse
+    than the current `limit`-th best are pruned.
+    """
+    def score(legs: List[FlightRecord]) -> float:
+        if sort_by == "duration":
+            return (legs[-1].arrival_time - legs[0].departure_time).total_seconds()
+        return sum(leg.price for leg in legs)
+
+    best: list = []  # max-heap of (-score, tiebreak, legs) holding the top `limit`
+    tiebreak = count()
+
+    def worse_than_kept(value: float) -> bool:
+        return len(best) >= limit and value >= -best[0][0]
+
+    def extend(legs: List[FlightRecord], visited: frozenset):
+        value = score(legs)
+        if worse_than_kept(value):
+            return
+        current = legs[-1]
+        if current.arrival_city == arrival_city:
+            entry = (-value, next(tiebreak), legs)
+            if len(best) < limit:
+                heapq.heappush(best, entry)
+            else:
+                heapq.heapreplace(best, entry)
+            return
+        if len(legs) > max_stops:
+            return
+        earliest = current.arrival_time + min_layover
+        latest = current.arrival_time + max_layover
+        final_leg = len(legs) == max_stops
+        for city in index.destinations(current.arrival_city):
+            if city in visited or (final_leg and city != arrival_city):
+                continue
+            for record in index.scan(current.arrival_city, city, earliest, latest):
+                if record.available_seats >= travelers:
+                    extend(legs + [record], visited | {city})
+
+    for city in index.destinations(departure_city):
+        if max_stops == 0 and city != arrival_city:
+            continue
+        for record in index.scan(departure_city, city, start, end):
+            if record.available_seats >= travelers:
+                extend([record], frozenset((departure_city, city)))
+
+    ranked = sorted(best, key=lambda entry: (-entry[0], entry[1]))
+    return [_itinerary(legs) for _, _, legs in ranked]
+
+
+class ConnectionService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def search(
+        self,
+        departure_city: str,
+        arrival_city: str,
+        date,
+        max_stops: int = 1,
+        min_layover_minutes: int = 45,
+        max_layover_minutes: int = 360,
+        sort_by: str = "price",
+        travelers: int = 1,
+        limit: int = 20
+    ) -> List[dict]:
+        start = datetime.combine(date, datetime.min.time())
+        max_layover = timedelta(minutes=max_layover_minutes)
+        if settings.FLIGHT_SEARCH_INDEX_ENABLED:
+            # The flight index doubles as the route graph and is maintained on flight writes
+            flight_index.ensure_loaded(self.db)
+            index = flight_index
+        else:
+            # Only the flights this search can reach, in a graph of its own
+            index = FlightSearchIndex(ttl_seconds=0)
+            index.load(
+                self.db,
+                Flight.departure_time >= start,
+                Flight.departure_time < start + timedelta(days=1) + max_stops * (MAX_LEG_DURATION + max_layover)
+            )
+        return find_connections(
+            index,
+            departure_city,
+            arrival_city,
+            start=start,
+            end=start + timedelta(days=1),
+            max_stops=max_stops,
+            min_layover=timedelta(minutes=min_layover_minutes),
+            max_layover=max_layover,
+            sort_by=sort_by,
+            travelers=travelers,
+            limit=limit
+        )
+
+    async def search_async(self, **kwargs) -> List[dict]:
+        """Run search() on the connection worker pool instead of the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(connection_executor, lambda: self.search(**kwargs))
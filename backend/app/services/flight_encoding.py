@@ -0,0 +1,162 @@
+import csv
+import io
+import json
+import sys
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import orjson
+except ImportError:  # Optional speed-up; the stdlib encoder produces equivalent JSON
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # Columnar msgpack responses are unavailable without it
+    msgpack = None
+
+try:
+    import pyarrow
+except ImportError:  # Arrow IPC responses are unavailable without it
+    pyarrow = None
+
+from .flight_service import FLIGHT_FIELDS
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+CSV_MEDIA_TYPE = "text/csv"
+COLUMNS_MEDIA_TYPE = "application/vnd.flights.columns+msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Fixed-width column types as NumPy dtype strings, so a client can decode each
+# column with np.frombuffer(data, dtype) without copying; other columns are strings
+COLUMN_DTYPES = {
+    "departure_time": "<M8[us]",
+    "arrival_time": "<M8[us]",
+    "price": "<f8",
+    "available_seats": "<i4",
+    "id": "<i8",
+}
+_ARRAY_TYPECODES = {"<M8[us]": "q", "<f8": "d", "<i4": "i", "<i8": "q"}
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def ndjson_chunks(chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """Encode row chunks as newline-delimited JSON objects, one chunk per yield"""
+    dumps = json.JSONEncoder(default=_json_default, ensure_ascii=False, separators=(",", ":")).encode
+    for rows in chunks:
+        yield "".join(dumps(dict(zip(FLIGHT_FIELDS, row))) + "\n" for row in rows).encode()
+
+
+def csv_chunks(chunks: Iterable[List[tuple]]) -> Iterator[bytes]:
+    """Encode row chunks as CSV with a header line, one chunk per yield"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(FLIGHT_FIELDS)
+    yield buffer.getvalue().encode()
+    for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            for row in rows
+        )
+        yield buffer.getvalue().encode()
+
+
+def encode_json_array(rows: Iterable[tuple]) -> bytes:
+    """
+    Encode FLIGHT_FIELDS-ordered tuples as a JSON array equivalent to FastAPI
+    serializing List[Flight] but without per-row model validation; float
+    spelling may differ (1e16 rather than 1e+16)
+    """
+    objects = [dict(zip(FLIGHT_FIELDS, row)) for row in rows]
+    return encode_json(objects)
+
+
+def encode_json(content) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content, default=_json_default, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _columns(rows: Sequence[tuple]) -> Dict[str, Sequence]:
+    transposed = list(zip(*rows)) if rows else [() for _ in FLIGHT_FIELDS]
+    return dict(zip(FLIGHT_FIELDS, transposed))
+
+
+def _epoch_microseconds(values: Iterable[datetime]) -> List[int]:
+    # Flight times are stored naive, so they map to naive datetime64 values
+    return [(value - _EPOCH) // _MICROSECOND for value in values]
+
+
+def _packed(values: Sequence, dtype: str) -> bytes:
+    if dtype == "<M8[us]":
+        values = _epoch_microseconds(values)
+    column = array(_ARRAY_TYPECODES[dtype], values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode_msgpack_columns(rows: Sequence[tuple], next_cursor: Optional[str] = None) -> bytes:
+    """
+    Encode FLIGHT_FIELDS-ordered tuples as one msgpack map of columns:
+
+        {"length": n, "fields": [...], "next_cursor": ...,
+         "columns": {name: {"dtype": "<f8", "data": <bytes>} | {"dtype": "str", "data": [...]}}}
+    """
+    columns = {}
+    for name, values in _columns(rows).items():
+        dtype = COLUMN_DTYPES.get(name)
+        if dtype is None:
+            columns[name] = {"dtype": "str", "data": list(values)}
+        else:
+            columns[name] = {"dtype": dtype, "data": _packed(values, dtype)}
+    return msgpack.packb({
+        "length": len(rows),
+        "fields": list(FLIGHT_FIELDS),
+        "columns": columns,
+        "next_cursor": next_cursor,
+    })
+
+
+def encode_arrow(rows: Sequence[tuple], next_cursor: Optional[str] = None) -> bytes:
+    """Encode FLIGHT_FIELDS-ordered tuples as an Arrow IPC stream (next_cursor in the schema metadata)"""
+    types = {
+        "<M8[us]": pyarrow.timestamp("us"),
+        "<f8": pyarrow.float64(),
+        "<i4": pyarrow.int32(),
+        "<i8": pyarrow.int64(),
+    }
+    table = pyarrow.table(
+        {
+            name: pyarrow.array(values, type=types.get(COLUMN_DTYPES.get(name), pyarrow.string()))
+            for name, values in _columns(rows).items()
+        },
+        metadata={"next_cursor": next_cursor} if next_cursor else None
+    )
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def columnar_encoders() -> Dict[str, Tuple[Callable[..., bytes], str]]:
+    """Columnar formats whose encoder library is installed: format -> (encode, media type)"""
+    encoders = {}
+    if msgpack is not None:
+        encoders["columns"] = (encode_msgpack_columns, COLUMNS_MEDIA_TYPE)
+    if pyarrow is not None:
+        encoders["arrow"] = (encode_arrow, ARROW_MEDIA_TYPE)
+    return encoders
+
@@ -0,0 +1,288 @@
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.flight import Flight, airline_code_for, minute_of_day
+
+
+class FlightRecord(NamedTuple):
+    """Read-only snapshot of a flight row, shaped like the Flight schema"""
+    id: int
+    flight_number: str
+    departure_city: str
+    arrival_city: str
+    departure_time: datetime
+    arrival_time: datetime
+    price: float
+    available_seats: int
+
+    @property
+    def departure_minute(self) -> int:
+        return minute_of_day(self.departure_time)
+
+    @property
+    def airline_code(self) -> str:
+        return airline_code_for(self.flight_number)
+
+    @classmethod
+    def from_flight(cls, flight: Flight) -> "FlightRecord":
+        return cls(
+            id=flight.id,
+            flight_number=flight.flight_number,
+            departure_city=flight.departure_city,
+            arrival_city=flight.arrival_city,
+            departure_time=flight.departure_time,
+            arrival_time=flight.arrival_time,
+            price=flight.price,
+            available_seats=flight.available_seats,
+        )
+
+
+Route = Tuple[str, str]
+SortKey = Tuple[datetime, int]
+
+
+class _RouteBucket:
+    """
+    Flights of one route kept sorted by (departure_time, id).
+
+    Writes replace the (keys, records) pair instead of mutating it, so
+    readers can scan a consistent snapshot without taking the index lock.
+    """
+
+    __slots__ = ("entries",)
+
+    def __init__(self, keys: Optional[List[SortKey]] = None, records: Optional[List[FlightRecord]] = None):
+        self.entries: Tuple[List[SortKey], List[FlightRecord]] = (keys or [], records or [])
+
+    def __len__(self) -> int:
+        return len(self.entries[0])
+
+    def add(self, record: FlightRecord):
+        keys, records = self.entries
+        key = (record.departure_time, record.id)
+        pos = bisect_left(keys, key)
+        self.entries = (keys[:pos] + [key] + keys[pos:], records[:pos] + [record] + records[pos:])
+
+    def remove(self, record: FlightRecord):
+        keys, records = self.entries
+        key = (record.departure_time, record.id)
+        pos = bisect_left(keys, key)
+        if pos < len(keys) and keys[pos] == key:
+            self.entries = (keys[:pos] + keys[pos + 1:], records[:pos] + records[pos + 1:])
+
+    def scan(self, start: Optional[SortKey], end: Optional[SortKey]) -> Iterator[FlightRecord]:
+        """Yield records with start <= key < end"""
+        keys, records = self.entries
+        lo = bisect_left(keys, start) if start is not None else 0
+        hi = bisect_left(keys, end) if end is not None else len(keys)
+        for i in range(lo, hi):
+            yield records[i]
+
+
+class FlightSearchIndex:
+    """
+    In-process search index over the flights table.
+
+    Flights are grouped by (departure_city, arrival_city) and each group is
+    sorted by departure time, so route searches become bisect range scans
+    instead of database round trips. FlightService keeps it up to date on
+    writes; the TTL bounds staleness from writes made by other workers.
+    Reads take no lock: writers swap in new snapshots under the lock.
+    """
+
+    # Rebuilds attempted before giving up on a quiet moment between writes
+    LOAD_ATTEMPTS = 3
+
+    def __init__(self, ttl_seconds: int = 300):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.RLock()
+        self._routes: Dict[Route, _RouteBucket] = {}
+        self._destinations: Dict[str, FrozenSet[str]] = {}
+        self._by_id: Dict[int, FlightRecord] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0  # Bumped by every upsert() and remove()
+
+    @property
+    def is_loaded(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        if self.ttl_seconds and time.monotonic() - self._loaded_at > self.ttl_seconds:
+            return False
+        return True
+
+    def ensure_loaded(self, db: Session):
+        if not self.is_loaded:
+            self.load(db)
+
+    def load(self, db: Session, *criteria):
+        """
+        (Re)build the whole index with a single query, optionally restricted
+        to flights matching `criteria`. A write reported while
+        the rows were being read may be missing from them, so the rebuild is
+        retried; if writes keep racing it, the last one is installed but left
+        unloaded, and the next search rebuilds again.
+        """
+        for attempt in range(self.LOAD_ATTEMPTS):
+            with self._lock:
+                generation = self._generation
+            routes, destinations, by_id = self._build(db, criteria)
+            with self._lock:
+                settled = generation == self._generation
+                if settled or attempt == self.LOAD_ATTEMPTS - 1:
+                    self._routes = routes
+                    self._destinations = destinations
+                    self._by_id = by_id
+                    self._loaded_at = time.monotonic() if settled else None
+                    return
+
+    def _build(self, db: Session, criteria: tuple) -> Tuple[Dict[Route, _RouteBucket], Dict[str, FrozenSet[str]], dict]:
+        """Routes, destinations and records by id, built from one query"""
+        rows = db.query(
+            Flight.id,
+            Flight.flight_number,
+            Flight.departure_city,
+            Flight.arrival_city,
+            Flight.departure_time,
+            Flight.arrival_time,
+            Flight.price,
+            Flight.available_seats,
+        ).filter(*criteria).order_by(Flight.departure_time, Flight.id).all()
+
+        grouped: Dict[Route, Tuple[List[SortKey], List[FlightRecord]]] = {}
+        by_id: Dict[int, FlightRecord] = {}
+        for row in rows:
+            record = FlightRecord(*row)
+            keys, records = grouped.setdefault((record.departure_city, record.arrival_city), ([], []))
+            # Rows arrive sorted, so appending keeps every group ordered
+            keys.append((record.departure_time, record.id))
+            records.append(record)
+            by_id[record.id] = record
+
+        routes = {route: _RouteBucket(keys, records) for route, (keys, records) in grouped.items()}
+        destinations: Dict[str, set] = {}
+        for origin, destination in routes:
+            destinations.setdefault(origin, set()).add(destination)
+        return routes, {city: frozenset(cities) for city, cities in destinations.items()}, by_id
+
+    def reset(self):
+        """Drop everything; the next search reloads from the database"""
+        with self._lock:
+            self._routes = {}
+            self._destinations = {}
+            self._by_id = {}
+            self._loaded_at = None
+
+    def upsert(self, flight: Flight):
+        record = FlightRecord.from_flight(flight)
+        with self._lock:
+            # Counted even when unloaded, so a rebuild in progress notices it
+            self._generation += 1
+            if not self.is_loaded:
+                return
+            self._discard(record.id)
+            route = (record.departure_city, record.arrival_city)
+            bucket = self._routes.get(route)
+            if bucket is None:
+                bucket = self._routes[route] = _RouteBucket()
+                origin = record.departure_city
+                self._destinations[origin] = self._destinations.get(origin, frozenset()) | {record.arrival_city}
+            bucket.add(record)
+            self._by_id[record.id] = record
+
+    def remove(self, flight_id: int):
+        with self._lock:
+            self._generation += 1
+            if not self.is_loaded:
+                return
+            self._discard(flight_id)
+
+    def _discard(self, flight_id: int):
+        old = self._by_id.pop(flight_id, None)
+        if old is None:
+            return
+        route = (old.departure_city, old.arrival_city)
+        bucket = self._routes.get(route)
+        if bucket is not None:
+            bucket.remove(old)
+            if not len(bucket):
+                del self._routes[route]
+                self._destinations[old.departure_city] -= {old.arrival_city}
+
+    def destinations(self, city: str) -> FrozenSet[str]:
+        """Cities with at least one direct flight from `city`"""
+        return self._destinations.get(city, frozenset())
+
+    def scan(
+        self,
+        departure_city: str,
+        arrival_city: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Iterator[FlightRecord]:
+        """Flights of one route departing in [start, end), in departure order"""
+        bucket = self._routes.get((departure_city, arrival_city))
+        if bucket is None:
+            return iter(())
+        return bucket.scan(
+            (start, 0) if start is not None else None,
+            (end, 0) if end is not None else None,
+        )
+
+    def search(
+        self,
+        departure_city: str,
+        arrival_city: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        airline: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        minute_start: Optional[int] = None,
+        minute_end: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 1000,
+        after: Optional[SortKey] = None,
+    ) -> List[FlightRecord]:
+        """
+        Range-scan one route between start (inclusive) and end (exclusive),
+        resuming strictly after the `after` key when paginating
+        """
+        bucket = self._routes.get((departure_city, arrival_city))
+        if bucket is None:
+            return []
+        lo = (start, 0) if start is not None else None
+        if after is not None:
+            resume = (after[0], after[1] + 1)
+            lo = resume if lo is None else max(lo, resume)
+        hi = (end, 0) if end is not None else None
+        results: List[FlightRecord] = []
+        for record in bucket.scan(lo, hi):
+            if airline and record.airline_code != airline.upper():
+                continue
+            if min_price is not None and record.price < min_price:
+                continue
+            if max_price is not None and record.price > max_price:
+                continue
+            if minute_start is not None and minute_end is not None:
+                minute = record.departure_minute
+                if minute_start <= minute_end:
+                    if not minute_start <= minute <= minute_end:
+                        continue
+                elif minute_end < minute < minute_start:  # Window wraps past midnight
+                    continue
+            if skip:
+                skip -= 1
+                continue
+            results.append(record)
+            if len(results) >= limit:
+                break
+        return results
+
+
+flight_index = FlightSearchIndex(ttl_seconds=settings.FLIGHT_SEARCH_INDEX_TTL_SECONDS)
@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+import time
+from datetime import date
+from typing import IO, Iterable, Iterator, List, Optional, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..core.database import get_session_factory
+from ..models.flight import Flight, airline_code_for, minute_of_day
+from ..models.rollup import mark_stale_dates
+from ..schemas.flight import FlightCreate
+from .catalog_cache import catalog_cache
+from .flight_index import flight_index
+from .stats_counters import stats_counters
+
+LOAD_FORMATS = ("csv", "ndjson")
+# Columns written for every loaded flight, in COPY order
+LOAD_COLUMNS = (
+    "flight_number", "departure_city", "arrival_city", "departure_time", "arrival_time",
+    "price", "available_seats", "departure_minute", "airline_code",
+)
+# Existing flights keep their seat count and seat map, which bookings own
+UPDATE_COLUMNS = tuple(column for column in LOAD_COLUMNS if column not in ("flight_number", "available_seats"))
+MAX_REPORTED_ERRORS = 20
+
+_flights_adapter = TypeAdapter(List[FlightCreate])
+
+# (line number, raw row or None, parse error or None)
+SourceRow = Tuple[int, Optional[dict], Optional[str]]
+
+
+def read_rows(lines: Iterable[str], format: str) -> Iterator[SourceRow]:
+    """Parse CSV (with a header row) or NDJSON lazily, one line at a time"""
+    if format == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row, None
+    elif format == "ndjson":
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, f"Invalid JSON: {e}"
+                continue
+            if isinstance(row, dict):
+                yield line_number, row, None
+            else:
+                yield line_number, None, "Expected a JSON object"
+    else:
+        raise ValueError(f"Unsupported format '{format}', expected one of {', '.join(LOAD_FORMATS)}")
+
+
+class FlightLoader:
+    """
+    Insert or update flights by flight_number in bulk, bypassing the ORM.
+
+    Rows are validated against FlightCreate a batch at a time. On PostgreSQL
+    with psycopg2, batches are streamed with COPY into a temporary staging
+    table and merged into flights with one INSERT ... ON CONFLICT; elsewhere
+    each batch is one executemany upsert. Everything, including the rollup
+    stale-date marks, commits as a single transaction; then the read caches
+    are refreshed.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self.use_copy = self._supports_copy()
+
+    def load(self, rows: Iterable[SourceRow], batch_size: int = 5000) -> dict:
+        started = time.perf_counter()
+        report = {"rows_read": 0, "rows_loaded": 0, "inserted": 0, "updated": 0, "rejected": 0, "errors": []}
+        stale_dates: Set[date] = set()
+        if self.use_copy:
+            self._create_staging_table()
+
+        try:
+            batch: List[Tuple[int, dict]] = []
+            for line_number, row, error in rows:
+                report["rows_read"] += 1
+                if error is not None:
+                    self._reject(report, line_number, error)
+                    continue
+                batch.append((line_number, row))
+                if len(batch) >= batch_size:
+                    self._load_batch(batch, report, stale_dates)
+                    batch = []
+            if batch:
+                self._load_batch(batch, report, stale_dates)
+            if self.use_copy:
+                self._merge_staging_table(report, stale_dates)
+            mark_stale_dates(self.db, stale_dates)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+        if report["rows_loaded"]:
+            self._flights_changed()
+        elapsed = time.perf_counter() - started
+        report["seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["rows_loaded"] / elapsed, 1) if elapsed else None
+        return report
+
+    def load_dicts(self, rows: Iterable[dict], batch_size: int = 5000) -> dict:
+        """Load flights built in Python, e.g. by the seed scripts"""
+        return self.load(((number, row, None) for number, row in enumerate(rows, start=1)), batch_size)
+
+    def _load_batch(self, batch: List[Tuple[int, dict]], report: dict, stale_dates: Set[date]):
+        values = []
+        for line_number, flight in self._validate(batch, report):
+            values.append({
+                **flight.model_dump(),
+                "departure_minute": minute_of_day(flight.departure_time),
+                "airline_code": airline_code_for(flight.flight_number),
+                "line_number": line_number,
+            })
+            stale_dates.add(flight.departure_time.date())
+        if not values:
+            return
+        report["rows_loaded"] += len(values)
+        if self.use_copy:
+            self._copy_to_staging(values)
+        else:
+            self._upsert(values, report, stale_dates)
+
+    def _validate(self, batch: List[Tuple[int, dict]], report: dict) -> List[Tuple[int, FlightCreate]]:
+        """Validate a whole batch in one call; only failing rows are rejected"""
+        while batch:
+            try:
+                flights = _flights_adapter.validate_python([row for _, row in batch])
+                break
+            except ValidationError as e:
+                failed = {}
+                for error in e.errors():
+                    field = ".".join(str(part) for part in error["loc"][1:])
+                    failed.setdefault(error["loc"][0], f"{field}: {error['msg']}")
+                for index in sorted(failed):
+                    self._reject(report, batch[index][0], failed[index])
+                batch = [item for index, item in enumerate(batch) if index not in failed]
+        else:
+            return []
+
+        valid = []
+        for (line_number, _), flight in zip(batch, flights):
+            if flight.arrival_time <= flight.departure_time:
+                self._reject(report, line_number, "arrival_time must be after departure_time")
+            elif flight.price < 0 or flight.available_seats < 0:
+                self._reject(report, line_number, "price and available_seats must not be negative")
+            else:
+                valid.append((line_number, flight))
+        return valid
+
+    def _reject(self, report: dict, line_number: int, message: str):
+        report["rejected"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"line": line_number, "error": message})
+
+    def _upsert(self, values: List[dict], report: dict, stale_dates: Set[date]):
+        """executemany INSERT ... ON CONFLICT (flight_number) for one batch"""
+        by_number = {row["flight_number"]: row for row in values}  # Last row wins
+        existing = self.db.execute(
+            select(Flight.flight_number, Flight.departure_time).where(Flight.flight_number.in_(by_number))
+        ).all()
+        stale_dates.update(departure.date() for _, departure in existing)
+        report["updated"] += len(existing)
+        report["inserted"] += len(by_number) - len(existing)
+
+        dialect_insert = postgresql_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        statement = dialect_insert(Flight.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=["flight_number"],
+            set_={column: statement.excluded[column] for column in UPDATE_COLUMNS}
+        )
+        self.db.execute(statement, [
+            {**{column: row[column] for column in LOAD_COLUMNS}, "seat_map": b""}
+            for row in by_number.values()
+        ])
+
+    def _supports_copy(self) -> bool:
+        bind = self.db.get_bind()
+        return bind.dialect.name == "postgresql" and bind.dialect.driver == "psycopg2"
+
+    def _create_staging_table(self):
+        self.db.execute(text(
+            "CREATE TEMPORARY TABLE flight_load_staging ("
+            " line_number integer, flight_number varchar, departure_city varchar, arrival_city varchar,"
+            " departure_time timestamp, arrival_time timestamp, price double precision,"
+            " available_seats integer, departure_minute integer, airline_code varchar(3)"
+            ") ON COMMIT DROP"
+        ))
+
+    def _copy_to_staging(self, values: List[dict]):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in values:
+            writer.writerow([row["line_number"], *(row[column] for column in LOAD_COLUMNS)])
+        buffer.seek(0)
+        cursor = self.db.connection().connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY flight_load_staging (line_number, {', '.join(LOAD_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+        finally:
+            cursor.close()
+
+    def _merge_staging_table(self, report: dict, stale_dates: Set[date]):
+        """Upsert every staged row into flights in one statement; the last line per flight_number wins"""
+        moved = self.db.execute(text(
+            "SELECT DISTINCT CAST(f.departure_time AS date) FROM flights f"
+            " JOIN flight_load_staging s ON s.flight_number = f.flight_number"
+        )).scalars()
+        stale_dates.update(moved)
+        columns = ", ".join(LOAD_COLUMNS)
+        updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in UPDATE_COLUMNS)
+        counts = self.db.execute(text(
+            f"WITH upserted AS ("
+            f" INSERT INTO flights ({columns}, seat_map)"
+            f" SELECT DISTINCT ON (flight_number) {columns}, ''::bytea FROM flight_load_staging"
+            f" ORDER BY flight_number, line_number DESC"
+            f" ON CONFLICT (flight_number) DO UPDATE SET {updates}"
+            f" RETURNING (xmax = 0) AS inserted"
+            f") SELECT COUNT(*) FILTER (WHERE inserted), COUNT(*) FILTER (WHERE NOT inserted) FROM upserted"
+        )).one()
+        report["inserted"] += counts[0]
+        report["updated"] += counts[1]
+
+    def _flights_changed(self):
+        """The load bypassed FlightService.flight_written(), so refresh what it would have"""
+        flight_index.reset()
+        catalog_cache.clear()
+        stats_counters.reconcile(self.db)
+
+
+def load_flights_file(file: IO[bytes], format: str, batch_size: int = 5000) -> dict:
+    """Load a CSV or NDJSON byte stream in a session of its own"""
+    lines = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    db = get_session_factory()()
+    try:
+        return FlightLoader(db).load(read_rows(lines, format), batch_size)
+    finally:
+        db.close()
@@ -1,33 +1,110 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from datetime import date
-from typing import List, Optional
+from sqlalchemy import and_, func, or_
+from datetime import date, datetime, timedelta
+from typing import Iterator, List, Optional, Tuple, Union
+import base64
+from operator import attrgetter
 
+from ..core.config import settings
+from ..models.airline import Airline
 from ..models.flight import Flight
+from ..models.schedule import ScheduleOverride
 from ..schemas.flight import FlightCreate, FlightUpdate
+from .catalog_cache import catalog_cache
+from .flight_index import FlightRecord, flight_index
+from .stats_counters import stats_counters
+
+# Column order of the Flight response schema, used by the row-oriented read paths
+FLIGHT_FIELDS = (
+    'flight_number', 'departure_city', 'arrival_city', 'departure_time',
+    'arrival_time', 'price', 'available_seats', 'id'
+)
+FLIGHT_COLUMNS = tuple(getattr(Flight, field) for field in FLIGHT_FIELDS)
+_record_fields = attrgetter(*FLIGHT_FIELDS)
+
+def _to_minutes(hhmm: str) -> int:
+    """Convert an 'HH:MM' string to minutes after midnight"""
+    try:
+        hours, minutes = (int(part) for part in hhmm.split(':'))
+    except ValueError:
+        raise ValueError(f"Invalid time '{hhmm}', expected HH:MM")
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time '{hhmm}', expected HH:MM")
+    return hours * 60 + minutes
+
+def encode_cursor(departure_time: datetime, flight_id: int) -> str:
+    """Build an opaque keyset cursor pointing just past the given flight"""
+    raw = f"{departure_time.isoformat()}|{flight_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        departure_time, flight_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(departure_time), int(flight_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+def _chunked(rows, chunk_size: int) -> Iterator[List[tuple]]:
+    chunk = []
+    for row in rows:
+        chunk.append(tuple(row))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
 
 class FlightService:
     def __init__(self, db: Session):
         self.db = db
 
     def get_airlines(self) -> List[str]:
-        """Get all unique airline codes from flights"""
-        # Extract airline codes from flight_number (first 2 characters)
-        result = self.db.query(
-            func.distinct(func.substr(Flight.flight_number, 1, 2)).label('airline')
-        ).all()
-        return [row.airline for row in result if row.airline]
-
-    def get_price_range(self, travelers: int = 1) -> dict:
+        """Get all unique airline codes from flights (cached until a flight write)"""
+        return catalog_cache.get_airline_codes(
+            lambda: (code for (code,) in self.db.query(Flight.airline_code).distinct())
+        )
+
+    def get_airline_details(self) -> List[dict]:
+        """Airline codes in service, with full names where the airlines table knows them"""
+        codes = self.get_airlines()
+        names = dict(self.db.query(Airline.code, Airline.name).filter(Airline.code.in_(codes)).all())
+        return [{'code': code, 'name': names.get(code)} for code in codes]
+
+    def get_price_bounds(
+        self,
+        departure_city: Optional[str] = None,
+        arrival_city: Optional[str] = None
+    ) -> Tuple[Optional[float], Optional[float]]:
+        """Cached (min, max) price over all flights, or over one route when both cities are given"""
+        key = (departure_city, arrival_city) if departure_city and arrival_city else None
+
+        def load():
+            query = self.db.query(func.min(Flight.price), func.max(Flight.price))
+            if key is not None:
+                query = query.filter(
+                    Flight.departure_city == departure_city,
+                    Flight.arrival_city == arrival_city
+                )
+            return tuple(query.one())
+
+        return catalog_cache.get_price_bounds(key, load)
+
+    def get_price_range(
+        self,
+        travelers: int = 1,
+        departure_city: Optional[str] = None,
+        arrival_city: Optional[str] = None
+    ) -> dict:
         """Get min and max prices from all flights (always returns per-person prices)"""
-        result = self.db.query(
-            func.min(Flight.price).label('min_price'),
-            func.max(Flight.price).label('max_price')
-        ).first()
-        
+        min_price, max_price = self.get_price_bounds(departure_city, arrival_city)
+
         # Get actual database range per person
-        actual_min = result.min_price or 0
-        actual_max = result.max_price or 1000  # Fallback if no flights
+        actual_min = min_price or 0
+        actual_max = max_price or 1000  # Fallback if no flights
         
         # Dynamic extension based on number of travelers for better filtering flexibility
         if travelers <= 2:
@@ -48,7 +125,57 @@ class FlightService:
             'travelers': travelers  # Include for frontend reference
         }
 
-    def get_flights(
+    def get_fare_calendar(
+        self,
+        departure_city: str,
+        arrival_city: str,
+        start_date: date,
+        days: int = 30
+    ) -> List[dict]:
+        """
+        Cheapest fare and flight count for each day of a route, from one
+        grouped query plus the schedule dates not expanded into flights yet
+        """
+        # Imported here: schedule_service builds on this module
+        from .schedule_service import ScheduleService
+
+        def load():
+            start = datetime.combine(start_date, datetime.min.time())
+            day = func.date(Flight.departure_time)
+            rows = self.db.query(
+                day.label('day'),
+                func.min(Flight.price).label('min_price'),
+                func.count(Flight.id).label('flight_count')
+            ).filter(
+                Flight.departure_city == departure_city,
+                Flight.arrival_city == arrival_city,
+                Flight.departure_time >= start,
+                Flight.departure_time < start + timedelta(days=days)
+            ).group_by(day).all()
+            # SQLite returns the day as an ISO string, PostgreSQL as a date
+            by_day = {
+                (row.day if isinstance(row.day, date) else date.fromisoformat(row.day)): (
+                    row.min_price, row.flight_count
+                )
+                for row in rows
+            }
+            scheduled = ScheduleService(self.db).scheduled_fares(
+                departure_city, arrival_city, start_date, start_date + timedelta(days=days - 1)
+            )
+            calendar = []
+            for offset in range(days):
+                current = start_date + timedelta(days=offset)
+                fares = [fare for fare in (by_day.get(current), scheduled.get(current)) if fare is not None]
+                calendar.append({
+                    'date': current,
+                    'min_price': min(fare[0] for fare in fares) if fares else None,
+                    'flight_count': sum(fare[1] for fare in fares)
+                })
+            return calendar
+
+        return catalog_cache.get_fare_calendar(((departure_city, arrival_city), start_date, days), load)
+
+    def get_flight_rows(
         self,
         departure_city: Optional[str] = None,
         arrival_city: Optional[str] = None,
@@ -59,18 +186,63 @@ class FlightService:
         dep_time_start: Optional[str] = None,
         dep_time_end: Optional[str] = None,
         skip: int = 0,
-        limit: int = 1000
-    ) -> List[Flight]:
-        # Start with optimized query - order by departure_time for better performance
-        query = self.db.query(Flight).order_by(Flight.departure_time)
+        limit: int = 1000,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[tuple]:
+        """
+        Matching flights as plain column tuples in FLIGHT_FIELDS order,
+        skipping ORM identity-map and instrumentation costs
+        """
+        if settings.FLIGHT_SEARCH_INDEX_ENABLED and departure_city and arrival_city:
+            records = self._search_index(
+                departure_city, arrival_city, date, airline, min_price, max_price,
+                dep_time_start, dep_time_end, skip, limit, after
+            )
+            return [_record_fields(record) for record in records]
+        query = self._filter_query(
+            self.db.query(*FLIGHT_COLUMNS), departure_city, arrival_city, date, airline,
+            min_price, max_price, dep_time_start, dep_time_end, after
+        ).order_by(Flight.departure_time, Flight.id)
+        return [tuple(row) for row in query.offset(skip).limit(limit).all()]
+
+    def iter_flight_rows(
+        self,
+        chunk_size: int = 1000,
+        skip: int = 0,
+        limit: Optional[int] = None,
+        **filters
+    ) -> Iterator[List[tuple]]:
+        """
+        Stream matching flights as chunks of plain column tuples (FLIGHT_FIELDS
+        order) from a server-side cursor, so memory stays flat for any result size
+        """
+        # Filters are applied eagerly so invalid input raises before streaming starts
+        query = self._filter_query(self.db.query(*FLIGHT_COLUMNS), **filters)
+        query = query.order_by(Flight.departure_time, Flight.id).offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return _chunked(query.yield_per(chunk_size), chunk_size)
+
+    def _filter_query(
+        self,
+        query,
+        departure_city: Optional[str] = None,
+        arrival_city: Optional[str] = None,
+        date: Optional[date] = None,
+        airline: Optional[str] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        dep_time_start: Optional[str] = None,
+        dep_time_end: Optional[str] = None,
+        after: Optional[Tuple[datetime, int]] = None
+    ):
+        """Apply the flight search filters to a query over Flight or its columns"""
         # Apply filters if provided
         if departure_city:
             query = query.filter(Flight.departure_city == departure_city)
         if arrival_city:
             query = query.filter(Flight.arrival_city == arrival_city)
         if date:
-            from sqlalchemy import func
-            from datetime import datetime, timedelta
             # Convert date to datetime for proper comparison
             start_of_day = datetime.combine(date, datetime.min.time())
             end_of_day = start_of_day + timedelta(days=1)
@@ -81,24 +253,93 @@ class FlightService:
                 )
             )
         if airline:
-            # Extract airline code from flight_number (e.g., 'QF' from 'QF286')
-            query = query.filter(Flight.flight_number.like(f"{airline}%"))
+            # Equality on the indexed airline code (e.g., 'QF' for 'QF286')
+            query = query.filter(Flight.airline_code == airline.upper())
         if min_price is not None:
             query = query.filter(Flight.price >= min_price)
         if max_price is not None:
             query = query.filter(Flight.price <= max_price)
-        # Time filtering - implement proper PostgreSQL compatible time filtering
+        # Time filtering - range predicate on the persisted minute-of-day column
         if dep_time_start and dep_time_end:
-            from sqlalchemy import text
-            # Use PostgreSQL's EXTRACT function for time comparison
+            start_minutes = _to_minutes(dep_time_start)
+            end_minutes = _to_minutes(dep_time_end)
+            if start_minutes <= end_minutes:
+                query = query.filter(Flight.departure_minute.between(start_minutes, end_minutes))
+            else:
+                # Window wraps past midnight, e.g. 22:00-02:00
+                query = query.filter(
+                    or_(
+                        Flight.departure_minute >= start_minutes,
+                        Flight.departure_minute <= end_minutes
+                    )
+                )
+        if after:
+            # Keyset pagination: seek past the last (departure_time, id) seen
+            after_time, after_id = after
             query = query.filter(
-                text("EXTRACT(hour FROM departure_time) * 60 + EXTRACT(minute FROM departure_time) BETWEEN :start_minutes AND :end_minutes")
-                .params(
-                    start_minutes=int(dep_time_start.split(':')[0]) * 60 + int(dep_time_start.split(':')[1]),
-                    end_minutes=int(dep_time_end.split(':')[0]) * 60 + int(dep_time_end.split(':')[1])
+                or_(
+                    Flight.departure_time > after_time,
+                    and_(Flight.departure_time == after_time, Flight.id > after_id)
                 )
             )
-        return query.offset(skip).limit(limit).all()
+        return query
+
+    def get_flight_rows_page(
+        self,
+        cursor: Optional[str] = None,
+        limit: int = 1000,
+        **filters
+    ) -> Tuple[List[tuple], Optional[str]]:
+        """
+        Keyset-paginated get_flight_rows. Every page costs the same regardless
+        of depth; next_cursor is None on the last page.
+        """
+        after = decode_cursor(cursor) if cursor else None
+        rows = self.get_flight_rows(limit=limit + 1, after=after, **filters)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = dict(zip(FLIGHT_FIELDS, rows[-1]))
+            next_cursor = encode_cursor(last['departure_time'], last['id'])
+        return rows, next_cursor
+
+    def _search_index(
+        self,
+        departure_city: str,
+        arrival_city: str,
+        date: Optional[date],
+        airline: Optional[str],
+        min_price: Optional[float],
+        max_price: Optional[float],
+        dep_time_start: Optional[str],
+        dep_time_end: Optional[str],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]] = None
+    ) -> List[Flight]:
+        flight_index.ensure_loaded(self.db)
+        start = end = None
+        if date:
+            start = datetime.combine(date, datetime.min.time())
+            end = start + timedelta(days=1)
+        minute_start = minute_end = None
+        if dep_time_start and dep_time_end:
+            minute_start = _to_minutes(dep_time_start)
+            minute_end = _to_minutes(dep_time_end)
+        return flight_index.search(
+            departure_city,
+            arrival_city,
+            start=start,
+            end=end,
+            airline=airline,
+            min_price=min_price,
+            max_price=max_price,
+            minute_start=minute_start,
+            minute_end=minute_end,
+            skip=skip,
+            limit=limit,
+            after=after
+        )
 
     def get_flight(self, flight_id: int) -> Optional[Flight]:
         return self.db.query(Flight).filter(Flight.id == flight_id).first()
@@ -108,22 +349,69 @@ class FlightService:
         self.db.add(db_flight)
         self.db.commit()
         self.db.refresh(db_flight)
+        self.flight_written(None, db_flight)
         return db_flight
         
     def update_flight(self, flight_id: int, flight_data: FlightUpdate) -> Optional[Flight]:
         db_flight = self.get_flight(flight_id)
         if db_flight:
+            before = FlightRecord.from_flight(db_flight)
             update_data = flight_data.dict(exclude_unset=True)
             for key, value in update_data.items():
                 setattr(db_flight, key, value)
             self.db.commit()
             self.db.refresh(db_flight)
+            self.flight_written(before, db_flight)
         return db_flight
     
     def delete_flight(self, flight_id: int) -> bool:
         db_flight = self.get_flight(flight_id)
         if db_flight:
+            before = FlightRecord.from_flight(db_flight)
+            if db_flight.schedule_id is not None:
+                self._cancel_service_date(db_flight.schedule_id, db_flight.service_date)
             self.db.delete(db_flight)
             self.db.commit()
+            self.flight_written(before, None)
             return True
-        return False
\ No newline at end of file
+        return False
+
+    def _cancel_service_date(self, schedule_id: int, service_date: date):
+        """Keep a deleted scheduled flight from being expanded again"""
+        override = self.db.query(ScheduleOverride).filter(
+            ScheduleOverride.schedule_id == schedule_id,
+            ScheduleOverride.service_date == service_date
+        ).first()
+        if override is None:
+            self.db.add(ScheduleOverride(schedule_id=schedule_id, service_date=service_date, cancelled=True))
+        else:
+            override.cancelled = True
+
+    def flight_written(self, before: Optional[FlightRecord], after: Optional[Union[Flight, FlightRecord]]):
+        """Propagate a committed flight write to the in-process read caches"""
+        if after is not None:
+            flight_index.upsert(after)
+        elif before is not None:
+            flight_index.remove(before.id)
+        record = FlightRecord.from_flight(after) if after is not None else None
+        catalog_cache.flight_written(before, record)
+        stats_counters.flight_written(before, record)
+
+
+class AsyncFlightService:
+    """
+    Awaitable FlightService for async endpoints: every method runs on the
+    AsyncSession's connection through run_sync, so the event loop is free
+    while the query is in flight.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    def __getattr__(self, name: str):
+        method = getattr(FlightService, name)
+
+        async def call(*args, **kwargs):
+            return await self.db.run_sync(lambda session: method(FlightService(session), *args, **kwargs))
+        return call
+
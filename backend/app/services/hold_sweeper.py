@@ -0,0 +1,23 @@
+import logging
+
+from ..core.database import get_session_factory
+from .booking_service import BookingService
+
+logger = logging.getLogger(__name__)
+
+
+def sweep_expired_holds(batch_size: int) -> int:
+    """Release every expired seat hold, `batch_size` holds per transaction"""
+    released_total = 0
+    db = get_session_factory()()
+    try:
+        while True:
+            released = BookingService(db).sweep_expired_holds(batch_size)
+            released_total += released
+            if released < batch_size:
+                break
+    finally:
+        db.close()
+    if released_total:
+        logger.info(f"Released {released_total} expired seat holds")
+    return released_total
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException
+
+from ..core import security
+from ..core.config import settings
+
+T = TypeVar("T")
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a small dedicated thread pool so a hash never blocks the
+    event loop, and caps how many operations may wait for it: beyond
+    max_queue waiting jobs, new ones are refused with 503 rather than
+    piling up, so a login storm slows logins instead of every request.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 64):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0  # Queued plus running
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self.queue_wait_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+        self.busy_seconds = 0.0
+
+    async def hash(self, password: str) -> str:
+        return await self._run(security.get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Verify, and rehash in the same job when the stored hash uses an outdated cost"""
+        verified, new_hash = await self._run(security.verify_and_update, password, hashed_password)
+        if new_hash is not None:
+            with self._lock:
+                self.rehashed += 1
+        return verified, new_hash
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        with self._lock:
+            if self.pending >= self.workers + self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many password operations in progress, please retry",
+                    headers={"Retry-After": "1"}
+                )
+            self.pending += 1
+        submitted = time.perf_counter()
+        # The slot is released exactly once: by the job when it runs, or by
+        # the caller when it goes away (e.g. is cancelled) before the job starts
+        state = {"job": "queued"}
+
+        def job():
+            with self._lock:
+                if state["job"] == "abandoned":
+                    return None
+                state["job"] = "running"
+            started = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                finished = time.perf_counter()
+                with self._lock:
+                    self.pending -= 1
+                    self.completed += 1
+                    self.queue_wait_seconds += started - submitted
+                    self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, started - submitted)
+                    self.busy_seconds += finished - started
+
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            with self._lock:
+                if state["job"] == "queued":
+                    state["job"] = "abandoned"
+                    self.pending -= 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "rounds": settings.PASSWORD_HASH_ROUNDS,
+                "running": min(self.pending, self.workers),
+                "queued": max(self.pending - self.workers, 0),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_queue_wait_ms": round(self.queue_wait_seconds / self.completed * 1000, 2) if self.completed else None,
+                "max_queue_wait_ms": round(self.max_queue_wait_seconds * 1000, 2),
+                "avg_hash_ms": round(self.busy_seconds / self.completed * 1000, 2) if self.completed else None,
+            }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
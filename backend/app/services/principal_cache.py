@@ -0,0 +1,102 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import NamedTuple, Optional, Tuple
+
+from ..core.config import settings
+
+
+class Principal(NamedTuple):
+    """Read-only snapshot of an authenticated user, shaped like the User schema"""
+    id: int
+    email: str
+    username: str
+    full_name: Optional[str]
+    is_active: bool
+    is_admin: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_user(cls, user) -> "Principal":
+        return cls(
+            user.id, user.email, user.username, user.full_name,
+            bool(user.is_active), bool(user.is_admin), user.created_at, user.updated_at
+        )
+
+
+class PrincipalCache:
+    """
+    Bounded LRU of validated access tokens to their user, so authenticated
+    requests skip the JWT decode and the user lookup. Entries live for
+    ttl_seconds or until the token expires, whichever is first; profile
+    updates through this worker invalidate the user's entries, and the TTL
+    bounds staleness from changes made elsewhere.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: int = 60):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Principal]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, token: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, principal = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[token]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(token)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Principal, token_expires_at: Optional[float] = None):
+        """Cache a principal; token_expires_at is the token's exp claim as a Unix timestamp"""
+        if not self.max_size or not self.ttl_seconds:
+            return
+        lifetime = self.ttl_seconds
+        if token_expires_at is not None:
+            lifetime = min(lifetime, token_expires_at - time.time())
+        if lifetime <= 0:
+            return
+        with self._lock:
+            self._entries[token] = (time.monotonic() + lifetime, principal)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int):
+        with self._lock:
+            stale = [token for token, (_, principal) in self._entries.items() if principal.id == user_id]
+            for token in stale:
+                del self._entries[token]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+principal_cache = PrincipalCache(max_size=settings.AUTH_CACHE_SIZE, ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS)
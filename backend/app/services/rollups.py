@@ -0,0 +1,290 @@
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import get_session_factory
+from ..models.booking import Booking
+from ..models.flight import Flight
+from ..models.rollup import (
+    BookingDailyRollup, RollupStaleDate, RollupWatermark, RouteDailyRollup, mark_stale_dates
+)
+
+BOOKINGS_WATERMARK = "bookings"
+# Present once route_daily_rollups has been built from every flight
+ROUTES_WATERMARK = "route_daily_rollups"
+
+# A booking id is assigned before its transaction commits, so a lower id can
+# become visible after a higher one; only count bookings older than this.
+SETTLE_TIME = timedelta(seconds=30)
+
+# Dimensions each time series can be grouped by
+SERIES_GROUPS = {
+    "day": ("date",),
+    "route": ("departure_city", "arrival_city"),
+    "airline": ("airline_code",),
+}
+
+RouteKey = Tuple[date, str, str, str]
+
+
+class RollupService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def process_new_bookings(self, batch_size: int) -> int:
+        """
+        Add up to `batch_size` bookings past the watermark to booking_daily_rollups
+        and return how many were consumed. The watermark moves in the same
+        transaction, so every booking is counted exactly once even with one
+        job per worker.
+        """
+        watermark = self._watermark(BOOKINGS_WATERMARK)
+        rows = self.db.query(
+            Booking.id,
+            Booking.created_at,
+            Booking.booking_status,
+            Flight.departure_city,
+            Flight.arrival_city,
+            Flight.airline_code,
+            Flight.departure_time,
+            Flight.price,
+        ).join(Flight, Flight.id == Booking.flight_id).filter(
+            Booking.id > watermark
+        ).order_by(Booking.id).limit(batch_size).all()
+
+        settled_before = datetime.utcnow() - SETTLE_TIME
+        settled = []
+        for row in rows:
+            if row.created_at >= settled_before:
+                break
+            settled.append(row)
+        if not settled:
+            self.db.rollback()
+            return 0
+
+        claimed = self.db.execute(
+            update(RollupWatermark)
+            .where(RollupWatermark.name == BOOKINGS_WATERMARK, RollupWatermark.last_id == watermark)
+            .values(last_id=settled[-1].id)
+        ).rowcount
+        if not claimed:
+            # Another worker took this batch
+            self.db.rollback()
+            return 0
+
+        totals: Dict[RouteKey, List] = defaultdict(lambda: [0, 0.0])
+        service_dates = set()
+        for row in settled:
+            if row.booking_status != "confirmed":
+                continue
+            key = (row.created_at.date(), row.departure_city, row.arrival_city, row.airline_code or "")
+            totals[key][0] += 1
+            totals[key][1] += row.price
+            service_dates.add(row.departure_time.date())
+        if totals:
+            self._add_booking_totals(totals)
+        # Bookings also change seats sold per departure date
+        mark_stale_dates(self.db, service_dates)
+        self.db.commit()
+        return len(settled)
+
+    def refresh_stale_dates(self) -> int:
+        """
+        Recompute route_daily_rollups for the departure dates marked stale by
+        flight and seat writes. The marks are claimed by deleting them in the
+        same transaction, so a failed refresh leaves them for the next run
+        and a date marked again meanwhile is kept for it too.
+        """
+        service_dates = sorted(self.db.execute(
+            delete(RollupStaleDate).returning(RollupStaleDate.service_date)
+        ).scalars().all())
+        if not service_dates:
+            self.db.rollback()
+            return 0
+        self._write_service_dates(service_dates)
+        self.db.commit()
+        return len(service_dates)
+
+    def _write_service_dates(self, service_dates: List[date]):
+        seats_sold = select(func.count(Booking.id)).where(
+            Booking.flight_id == Flight.id,
+            Booking.booking_status == "confirmed"
+        ).correlate(Flight).scalar_subquery()
+
+        rows = []
+        for service_date in service_dates:
+            start = datetime.combine(service_date, time.min)
+            flights = self.db.query(
+                Flight.departure_city,
+                Flight.arrival_city,
+                Flight.airline_code,
+                Flight.price,
+                Flight.available_seats,
+                seats_sold.label("seats_sold"),
+            ).filter(Flight.departure_time >= start, Flight.departure_time < start + timedelta(days=1))
+
+            totals: Dict[RouteKey, List] = defaultdict(lambda: [0, 0, 0, 0.0])
+            for flight in flights:
+                total = totals[(service_date, flight.departure_city, flight.arrival_city, flight.airline_code or "")]
+                total[0] += 1
+                total[1] += flight.seats_sold
+                total[2] += flight.available_seats
+                total[3] += flight.seats_sold * flight.price
+            rows.extend(
+                {
+                    "service_date": key[0],
+                    "departure_city": key[1],
+                    "arrival_city": key[2],
+                    "airline_code": key[3],
+                    "flights": total[0],
+                    "seats_sold": total[1],
+                    "seats_available": total[2],
+                    "revenue": total[3],
+                }
+                for key, total in totals.items()
+            )
+
+        self.db.execute(delete(RouteDailyRollup).where(RouteDailyRollup.service_date.in_(service_dates)))
+        if rows:
+            self.db.execute(RouteDailyRollup.__table__.insert(), rows)
+
+    def is_built(self) -> bool:
+        return self.db.get(RollupWatermark, ROUTES_WATERMARK) is not None
+
+    def rebuild(self, batch_size: int = 5000):
+        """
+        Rebuild both rollups from scratch (after writes that bypass the
+        services, such as bulk loads). Bookings are recounted by the
+        incremental job from a reset watermark.
+        """
+        service_dates = {departure.date() for (departure,) in self.db.query(Flight.departure_time)}
+        self.db.execute(delete(RouteDailyRollup))
+        self.db.execute(delete(BookingDailyRollup))
+        self.db.execute(delete(RollupWatermark))
+        self.db.execute(delete(RollupStaleDate))
+        self.db.add(RollupWatermark(name=ROUTES_WATERMARK, last_id=0))
+        self._write_service_dates(sorted(service_dates))
+        self.db.commit()
+        while self.process_new_bookings(batch_size) == batch_size:
+            pass
+
+    def route_series(
+        self,
+        start_date: date,
+        end_date: date,
+        group_by: str = "day",
+        departure_city: Optional[str] = None,
+        arrival_city: Optional[str] = None,
+        airline_code: Optional[str] = None,
+    ) -> List[dict]:
+        """Flights, seats sold and load factor by departure date, route or airline"""
+        rows = self._series(
+            RouteDailyRollup, RouteDailyRollup.service_date,
+            [
+                func.sum(RouteDailyRollup.flights).label("flights"),
+                func.sum(RouteDailyRollup.seats_sold).label("seats_sold"),
+                func.sum(RouteDailyRollup.seats_available).label("seats_available"),
+                func.sum(RouteDailyRollup.revenue).label("revenue"),
+            ],
+            start_date, end_date, group_by, departure_city, arrival_city, airline_code
+        )
+        for row in rows:
+            capacity = row["seats_sold"] + row["seats_available"]
+            row["load_factor"] = round(row["seats_sold"] / capacity, 4) if capacity else None
+        return rows
+
+    def booking_series(
+        self,
+        start_date: date,
+        end_date: date,
+        group_by: str = "day",
+        departure_city: Optional[str] = None,
+        arrival_city: Optional[str] = None,
+        airline_code: Optional[str] = None,
+    ) -> List[dict]:
+        """Seats sold and revenue by booking date, route or airline"""
+        return self._series(
+            BookingDailyRollup, BookingDailyRollup.booking_date,
+            [
+                func.sum(BookingDailyRollup.bookings).label("bookings"),
+                func.sum(BookingDailyRollup.revenue).label("revenue"),
+            ],
+            start_date, end_date, group_by, departure_city, arrival_city, airline_code
+        )
+
+    def _series(self, model, date_column, measures, start_date, end_date, group_by,
+                departure_city, arrival_city, airline_code) -> List[dict]:
+        columns = {
+            "date": date_column.label("date"),
+            "departure_city": model.departure_city,
+            "arrival_city": model.arrival_city,
+            "airline_code": model.airline_code,
+        }
+        group = [columns[name] for name in SERIES_GROUPS[group_by]]
+        query = self.db.query(*group, *measures).filter(date_column >= start_date, date_column <= end_date)
+        if departure_city:
+            query = query.filter(model.departure_city == departure_city)
+        if arrival_city:
+            query = query.filter(model.arrival_city == arrival_city)
+        if airline_code:
+            query = query.filter(model.airline_code == airline_code.upper())
+        return [row._asdict() for row in query.group_by(*group).order_by(*group)]
+
+    def _watermark(self, name: str) -> int:
+        row = self.db.get(RollupWatermark, name)
+        if row is not None:
+            return row.last_id
+        self.db.add(RollupWatermark(name=name, last_id=0))
+        try:
+            self.db.commit()
+        except IntegrityError:
+            self.db.rollback()  # Created concurrently by another worker
+        return 0
+
+    def _add_booking_totals(self, totals: Dict[RouteKey, List]):
+        dialect_insert = postgresql_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        statement = dialect_insert(BookingDailyRollup).values([
+            {
+                "booking_date": key[0],
+                "departure_city": key[1],
+                "arrival_city": key[2],
+                "airline_code": key[3],
+                "bookings": bookings,
+                "revenue": revenue,
+            }
+            for key, (bookings, revenue) in totals.items()
+        ])
+        self.db.execute(statement.on_conflict_do_update(
+            index_elements=["booking_date", "departure_city", "arrival_city", "airline_code"],
+            set_={
+                "bookings": BookingDailyRollup.bookings + statement.excluded.bookings,
+                "revenue": BookingDailyRollup.revenue + statement.excluded.revenue,
+            }
+        ))
+
+
+def refresh_rollups():
+    """
+    Bring the rollups up to date in a session of its own (run periodically
+    by the app lifespan): count new bookings, then recompute stale dates.
+    """
+    db = get_session_factory()()
+    try:
+        service = RollupService(db)
+        if not service.is_built():
+            service.rebuild(settings.ROLLUP_BATCH_SIZE)
+        while service.process_new_bookings(settings.ROLLUP_BATCH_SIZE) == settings.ROLLUP_BATCH_SIZE:
+            pass
+        service.refresh_stale_dates()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,234 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import get_session_factory
+from ..models.flight import Flight, airline_code_for, minute_of_day
+from ..models.rollup import mark_stale_dates
+from ..models.schedule import FlightSchedule, ScheduleOverride
+from ..schemas.schedule import FlightScheduleCreate, FlightScheduleUpdate, ScheduleOverrideCreate
+from .catalog_cache import catalog_cache
+from .flight_index import FlightRecord
+from .flight_service import FLIGHT_COLUMNS, FlightService
+
+# Flights per INSERT when expanding, well under SQLite's bound-parameter limit
+EXPAND_CHUNK_SIZE = 1000
+
+
+def instance_flight_number(flight_number: str, service_date: date) -> str:
+    return f"{flight_number}-{service_date:%y%m%d}"
+
+
+def service_dates(schedule: FlightSchedule, start_date: date, end_date: date) -> Iterator[date]:
+    """Dates in [start_date, end_date] on which the schedule operates"""
+    current = max(start_date, schedule.valid_from)
+    last = min(end_date, schedule.valid_until)
+    while current <= last:
+        if str(current.isoweekday()) in schedule.days_of_week:
+            yield current
+        current += timedelta(days=1)
+
+
+class ScheduleService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_schedules(self, skip: int = 0, limit: int = 100) -> List[FlightSchedule]:
+        return self.db.query(FlightSchedule).order_by(FlightSchedule.id).offset(skip).limit(limit).all()
+
+    def get_schedule(self, schedule_id: int) -> Optional[FlightSchedule]:
+        return self.db.get(FlightSchedule, schedule_id)
+
+    def create_schedule(self, schedule: FlightScheduleCreate) -> FlightSchedule:
+        self._check_validity(schedule.valid_from, schedule.valid_until)
+        db_schedule = FlightSchedule(**schedule.model_dump())
+        self.db.add(db_schedule)
+        self.db.commit()
+        self.db.refresh(db_schedule)
+        self._schedules_changed()
+        return db_schedule
+
+    def update_schedule(self, schedule_id: int, schedule_data: FlightScheduleUpdate) -> Optional[FlightSchedule]:
+        """Changes apply to service dates not expanded yet; expanded flights are edited as flights"""
+        db_schedule = self.get_schedule(schedule_id)
+        if db_schedule is None:
+            return None
+        for key, value in schedule_data.model_dump(exclude_unset=True).items():
+            setattr(db_schedule, key, value)
+        self._check_validity(db_schedule.valid_from, db_schedule.valid_until)
+        self.db.commit()
+        self.db.refresh(db_schedule)
+        self._schedules_changed()
+        return db_schedule
+
+    def set_override(self, schedule_id: int, override: ScheduleOverrideCreate) -> ScheduleOverride:
+        """Cancel or reprice one service date that has not been expanded yet"""
+        if self.get_schedule(schedule_id) is None:
+            raise HTTPException(status_code=404, detail="Schedule not found")
+        expanded = self.db.query(Flight.id).filter(
+            Flight.schedule_id == schedule_id, Flight.service_date == override.service_date
+        ).first()
+        if expanded is not None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Flight {expanded.id} already operates this date; update or delete it instead"
+            )
+        db_override = self.db.query(ScheduleOverride).filter(
+            ScheduleOverride.schedule_id == schedule_id,
+            ScheduleOverride.service_date == override.service_date
+        ).first()
+        if db_override is None:
+            db_override = ScheduleOverride(schedule_id=schedule_id)
+            self.db.add(db_override)
+        for key, value in override.model_dump().items():
+            setattr(db_override, key, value)
+        self.db.commit()
+        self.db.refresh(db_override)
+        # Fare calendars answer dates beyond the horizon from the schedules
+        catalog_cache.clear()
+        return db_override
+
+    def expand_horizon(self) -> int:
+        """Expand every schedule from today through SCHEDULE_HORIZON_DAYS ahead"""
+        return self.expand(date.today(), date.today() + timedelta(days=settings.SCHEDULE_HORIZON_DAYS))
+
+    def scheduled_fares(
+        self,
+        departure_city: str,
+        arrival_city: str,
+        start_date: date,
+        end_date: date
+    ) -> Dict[date, Tuple[float, int]]:
+        """
+        Cheapest fare and departure count per day in [start_date, end_date]
+        for one route, from the service dates that have no flight yet
+        (typically those beyond the horizon), with overrides applied. Nothing
+        is written; past dates are left out.
+        """
+        start_date = max(start_date, date.today())
+        schedules = self.db.query(FlightSchedule).filter(
+            FlightSchedule.departure_city == departure_city,
+            FlightSchedule.arrival_city == arrival_city,
+            FlightSchedule.valid_from <= end_date,
+            FlightSchedule.valid_until >= start_date
+        ).all()
+        if not schedules or start_date > end_date:
+            return {}
+        overrides, existing = self._expansion_state(schedules, start_date, end_date)
+
+        fares: Dict[date, Tuple[float, int]] = {}
+        for schedule in schedules:
+            for service_date in service_dates(schedule, start_date, end_date):
+                if (schedule.id, service_date) in existing:
+                    continue
+                override = overrides.get((schedule.id, service_date))
+                if override is not None and override.cancelled:
+                    continue
+                price = override.price if override is not None and override.price is not None else schedule.price
+                min_price, count = fares.get(service_date, (price, 0))
+                fares[service_date] = (min(min_price, price), count + 1)
+        return fares
+
+    def expand(self, start_date: date, end_date: date) -> int:
+        """
+        Insert the flights the schedules call for in [start_date, end_date]
+        that do not exist yet, skipping cancelled dates; returns how many
+        were created. Safe to run concurrently: a (schedule, date) pair that
+        already has a flight is skipped by the insert.
+        """
+        schedules = self.db.query(FlightSchedule).filter(
+            FlightSchedule.valid_from <= end_date,
+            FlightSchedule.valid_until >= start_date
+        ).all()
+        if not schedules:
+            return 0
+        overrides, existing = self._expansion_state(schedules, start_date, end_date)
+
+        rows = []
+        for schedule in schedules:
+            for service_date in service_dates(schedule, start_date, end_date):
+                if (schedule.id, service_date) in existing:
+                    continue
+                override = overrides.get((schedule.id, service_date))
+                if override is not None and override.cancelled:
+                    continue
+                departure = datetime.combine(service_date, schedule.departure_time)
+                flight_number = instance_flight_number(schedule.flight_number, service_date)
+                rows.append({
+                    "flight_number": flight_number,
+                    "departure_city": schedule.departure_city,
+                    "arrival_city": schedule.arrival_city,
+                    "departure_time": departure,
+                    "arrival_time": departure + timedelta(minutes=schedule.duration_minutes),
+                    "price": override.price if override is not None and override.price is not None else schedule.price,
+                    "available_seats": (
+                        override.capacity if override is not None and override.capacity is not None
+                        else schedule.capacity
+                    ),
+                    "departure_minute": minute_of_day(departure),
+                    "airline_code": airline_code_for(flight_number),
+                    "seat_map": b"",
+                    "schedule_id": schedule.id,
+                    "service_date": service_date,
+                })
+        if not rows:
+            return 0
+
+        dialect_insert = postgresql_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        created = []
+        for offset in range(0, len(rows), EXPAND_CHUNK_SIZE):
+            statement = dialect_insert(Flight).values(rows[offset:offset + EXPAND_CHUNK_SIZE])
+            created.extend(self.db.execute(
+                statement.on_conflict_do_nothing().returning(*FLIGHT_COLUMNS)
+            ).all())
+        mark_stale_dates(self.db, {row.departure_time.date() for row in created})
+        self.db.commit()
+        flight_service = FlightService(self.db)
+        for row in created:
+            flight_service.flight_written(None, FlightRecord.from_flight(row))
+        return len(created)
+
+    def _expansion_state(self, schedules: List[FlightSchedule], start_date: date, end_date: date) -> tuple:
+        """Overrides by (schedule_id, service_date), and the pairs that already have a flight"""
+        schedule_ids = [schedule.id for schedule in schedules]
+        overrides = {
+            (override.schedule_id, override.service_date): override
+            for override in self.db.query(ScheduleOverride).filter(
+                ScheduleOverride.schedule_id.in_(schedule_ids),
+                ScheduleOverride.service_date.between(start_date, end_date)
+            )
+        }
+        existing = {
+            tuple(row) for row in self.db.query(Flight.schedule_id, Flight.service_date).filter(
+                Flight.schedule_id.in_(schedule_ids),
+                Flight.service_date.between(start_date, end_date)
+            )
+        }
+        return overrides, existing
+
+    def _check_validity(self, valid_from: date, valid_until: date):
+        if valid_until < valid_from:
+            raise HTTPException(status_code=400, detail="valid_until must not be before valid_from")
+
+    def _schedules_changed(self):
+        """Expand the horizon now so the change is searchable without waiting for the job"""
+        self.expand_horizon()
+        catalog_cache.clear()
+
+
+def extend_schedule_horizon():
+    """
+    Expand the schedules SCHEDULE_HORIZON_DAYS ahead in a session of its own
+    (run periodically by the app lifespan). This and schedule changes are the
+    only places flights are created from schedules; searches never write.
+    """
+    db = get_session_factory()()
+    try:
+        ScheduleService(db).expand_horizon()
+    finally:
+        db.close()
@@ -0,0 +1,81 @@
+import re
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models.booking import Booking
+
+# Cabin layout used by the seat picker: rows numbered from 1, six seats per row.
+# Seat "{row}{letter}" is bit (row - 1) * 6 + letter index of a flight's seat map,
+# stored little-endian in flights.seat_map.
+SEAT_LETTERS = "ABCDEF"
+_SEAT_LABEL = re.compile(r"^([1-9][0-9]{0,2})([A-F])$")
+
+
+def seat_index(label: str) -> int:
+    match = _SEAT_LABEL.match(label.strip().upper())
+    if match is None:
+        raise ValueError(f"Invalid seat number '{label}', expected e.g. 12C")
+    row, letter = match.groups()
+    return (int(row) - 1) * len(SEAT_LETTERS) + SEAT_LETTERS.index(letter)
+
+
+def seat_label(index: int) -> str:
+    row, column = divmod(index, len(SEAT_LETTERS))
+    return f"{row + 1}{SEAT_LETTERS[column]}"
+
+
+def seat_mask(labels: Iterable[str]) -> int:
+    """Bitmask of the given seat labels (raises ValueError on a malformed label)"""
+    mask = 0
+    for label in labels:
+        mask |= 1 << seat_index(label)
+    return mask
+
+
+def from_bytes(data: Optional[bytes]) -> int:
+    return int.from_bytes(data or b"", "little")
+
+
+def to_bytes(mask: int) -> bytes:
+    return mask.to_bytes((mask.bit_length() + 7) // 8, "little")
+
+
+def seat_labels(mask: int) -> List[str]:
+    labels = []
+    while mask:
+        lowest = mask & -mask
+        labels.append(seat_label(lowest.bit_length() - 1))
+        mask ^= lowest
+    return labels
+
+
+def seat_runs(mask: int) -> List[Tuple[int, int]]:
+    """Run-length form of a seat map: (first seat index, length) for each block of taken seats"""
+    runs = []
+    index = 0
+    while mask:
+        skipped = (mask & -mask).bit_length() - 1  # Trailing free seats
+        mask >>= skipped
+        index += skipped
+        length = (~mask & (mask + 1)).bit_length() - 1  # Trailing taken seats
+        runs.append((index, length))
+        mask >>= length
+        index += length
+    return runs
+
+
+def seat_mask_from_bookings(db: Session, flight_id: int) -> int:
+    """Rebuild a flight's seat map from its confirmed bookings"""
+    seats = db.query(Booking.seat_number).filter(
+        Booking.flight_id == flight_id,
+        Booking.booking_status == "confirmed"
+    )
+    mask = 0
+    for (seat_number,) in seats:
+        try:
+            mask |= 1 << seat_index(seat_number or "")
+        except ValueError:
+            continue  # Legacy seat outside the cabin layout
+    return mask
+
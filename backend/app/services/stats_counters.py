@@ -0,0 +1,83 @@
+import threading
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from ..core.database import get_session_factory
+from ..models.booking import Booking
+from ..models.flight import Flight
+from .flight_index import FlightRecord
+
+
+class StatsCounters:
+    """
+    Process-local dashboard totals. Flight and booking writes adjust them in
+    place; reconcile() recounts from the database to correct drift from other
+    workers, cascaded deletes, and flights that have since departed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total_flights = 0
+        self.total_bookings = 0
+        self.upcoming_flights = 0
+        self.reconciled_at: Optional[datetime] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.reconciled_at is not None
+
+    def ensure_loaded(self, db: Session):
+        if not self.is_loaded:
+            self.reconcile(db)
+
+    def reconcile(self, db: Session):
+        now = datetime.now()
+        flights = db.query(
+            func.count(Flight.id),
+            func.coalesce(func.sum(case((Flight.departure_time > now, 1), else_=0)), 0)
+        ).one()
+        total_bookings = db.query(func.count(Booking.id)).scalar() or 0
+        with self._lock:
+            self.total_flights = int(flights[0])
+            self.upcoming_flights = int(flights[1])
+            self.total_bookings = int(total_bookings)
+            self.reconciled_at = now
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "total_flights": self.total_flights,
+                "total_bookings": self.total_bookings,
+                "upcoming_flights": self.upcoming_flights,
+                "reconciled_at": self.reconciled_at,
+            }
+
+    def flight_written(self, before: Optional[FlightRecord], after: Optional[FlightRecord]):
+        """Apply a flight insert (before=None), update, or delete (after=None)"""
+        now = datetime.now()
+        with self._lock:
+            if before is not None:
+                self.total_flights -= 1
+                self.upcoming_flights -= before.departure_time > now
+            if after is not None:
+                self.total_flights += 1
+                self.upcoming_flights += after.departure_time > now
+
+    def bookings_created(self, count: int):
+        with self._lock:
+            self.total_bookings += count
+
+
+stats_counters = StatsCounters()
+
+
+def reconcile_stats_counters():
+    """Recount the dashboard totals in a session of its own (run periodically by the app lifespan)"""
+    db = get_session_factory()()
+    try:
+        stats_counters.reconcile(db)
+    finally:
+        db.close()
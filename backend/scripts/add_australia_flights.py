@@ -9,6 +9,8 @@ sys.path.insert(0, str(backend_dir))
 from app.core.database import SessionLocal
 from app.models.flight import Flight
 from app.models.user import User
+from app.db.seed import seed_airlines
+from app.services.flight_loader import FlightLoader
 from sqlalchemy.exc import IntegrityError
 
 def add_australian_flights():
@@ -39,6 +41,13 @@ def add_australian_flights():
             "Tiger Airways Australia": ["TT"],
             "Bonza": ["AB"]
         }
+
+        # Register full airline names for every prefix we generate
+        seed_airlines(db, {
+            prefix: airline
+            for airline, prefixes in airline_prefixes.items()
+            for prefix in prefixes
+        })
         
         # Popular Australian routes
         popular_routes = [
@@ -186,7 +195,7 @@ def add_australian_flights():
                 # Random available seats (50-300 depending on aircraft type)
                 available_seats = random.choice([50, 70, 100, 120, 150, 180, 200, 250, 300])
                 
-                flight = Flight(
+                flight = dict(
                     flight_number=flight_num,
                     departure_city=departure_city,
                     arrival_city=arrival_city,
@@ -205,12 +214,8 @@ def add_australian_flights():
         print(f"📊 Generated {len(flights_to_add)} Australian flights")
         print("💾 Adding flights to database...")
         
-        batch_size = 100
-        for i in range(0, len(flights_to_add), batch_size):
-            batch = flights_to_add[i:i + batch_size]
-            db.add_all(batch)
-            db.commit()
-            print(f"✓ Added batch {i//batch_size + 1}/{(len(flights_to_add) + batch_size - 1)//batch_size}")
+        report = FlightLoader(db).load_dicts(flights_to_add)
+        print(f"✓ Loaded {report['rows_loaded']} flights in {report['seconds']}s ({report['rows_per_second']} rows/s)")
         
         # Final verification
         total_flights = db.query(Flight).count()
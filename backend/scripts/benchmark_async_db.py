@@ -0,0 +1,90 @@
+"""
+Compare request throughput of one event loop when flight queries go through
+the blocking Session versus the AsyncSession used by the async endpoints.
+
+    python scripts/benchmark_async_db.py --requests 500 --concurrency 50 --latency-ms 5
+
+--latency-ms adds a server-side pg_sleep to every request (PostgreSQL only)
+to stand in for network round trips to a remote database. AsyncSession can
+only come out ahead when requests spend their time waiting on the database;
+against a local SQLite file it is slower, since each query makes an extra
+thread hop with nothing to overlap.
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import text
+
+from app.core.database import AsyncSessionLocal, SessionLocal, engine
+from app.services.flight_service import AsyncFlightService, FlightService
+
+
+def simulated_latency(session, latency_ms: float):
+    if latency_ms and session.get_bind().dialect.name == "postgresql":
+        session.execute(text("SELECT pg_sleep(:seconds)"), {"seconds": latency_ms / 1000})
+
+
+def query_flights(session, latency_ms: float, limit: int):
+    simulated_latency(session, latency_ms)
+    return FlightService(session).get_flight_rows(limit=limit)
+
+
+async def sync_request(latency_ms: float, limit: int):
+    # What the handlers did before: the whole query blocks the event loop
+    db = SessionLocal()
+    try:
+        return query_flights(db, latency_ms, limit)
+    finally:
+        db.close()
+
+
+async def async_request(latency_ms: float, limit: int):
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(simulated_latency, latency_ms)
+        return await AsyncFlightService(db).get_flight_rows(limit=limit)
+
+
+async def run(request, total: int, concurrency: int, latency_ms: float, limit: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await request(latency_ms, limit)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    return time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--limit", type=int, default=50, help="Flights returned per request")
+    args = parser.parse_args()
+
+    if args.latency_ms and engine.dialect.name != "postgresql":
+        print("⚠️  --latency-ms needs PostgreSQL; running without simulated latency")
+
+    print(f"🚀 {args.requests} requests, {args.concurrency} in flight, {engine.dialect.name} database")
+    # Warm both pools so connection setup is not measured
+    await sync_request(0, 1)
+    await async_request(0, 1)
+
+    results = {}
+    for name, request in (("sync Session", sync_request), ("AsyncSession", async_request)):
+        elapsed = await run(request, args.requests, args.concurrency, args.latency_ms, args.limit)
+        results[name] = args.requests / elapsed
+        print(f"   {name:<13} {elapsed:8.2f}s  {results[name]:10.1f} req/s")
+    print(f"📊 Throughput ratio (AsyncSession / sync Session): {results['AsyncSession'] / results['sync Session']:.2f}x")
+
+if __name__ == "__main__":
+    asyncio.run(main())
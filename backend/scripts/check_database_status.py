@@ -123,18 +123,18 @@ def check_database_status():
             # Airline distribution
             result = db.execute(text("""
                 SELECT 
-                    SUBSTRING(flight_number FROM 1 FOR 2) as airline,
+                    f.airline_code,
+                    a.name,
                     COUNT(*) as count
-                FROM flights 
-                GROUP BY SUBSTRING(flight_number FROM 1 FOR 2)
+                FROM flights f
+                LEFT JOIN airlines a ON a.code = f.airline_code
+                GROUP BY f.airline_code, a.name
                 ORDER BY count DESC
             """))
             
             print(f"   Airlines:")
-            airline_names = {'QF': 'Qantas', 'VA': 'Virgin Australia', 'JQ': 'Jetstar', 'ZL': 'Rex Airlines', 'TT': 'Tigerair'}
             for row in result:
-                airline_name = airline_names.get(row[0], 'Unknown')
-                print(f"   • {row[0]} ({airline_name}): {row[1]} flights")
+                print(f"   • {row[0]} ({row[1] or 'Unknown'}): {row[2]} flights")
             
             # Price analysis
             result = db.execute(text("""
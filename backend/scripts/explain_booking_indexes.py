@@ -0,0 +1,122 @@
+"""
+Show query plans for the hot booking queries without and with the booking
+indexes, optionally on synthetic bookings.
+
+    python scripts/explain_booking_indexes.py --seed 200000
+
+Everything runs in one transaction that is rolled back: synthetic rows are
+inserted, the indexes are dropped for the "before" plans and recreated for
+the "after" plans. Dropping an index locks the bookings table until the
+rollback, so run this against a staging copy, not production.
+"""
+import argparse
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from sqlalchemy import text
+
+from app.core.database import get_engine
+from app.db.migrate import upgrade_schema
+from app.models.booking import Booking
+from app.services import seat_map
+
+INDEXES = ["uq_bookings_confirmed_seat", "ix_bookings_flight_status_seat", "ix_bookings_user_created"]
+
+QUERIES = {
+    "booked seats of a flight": (
+        "SELECT seat_number FROM bookings WHERE flight_id = :flight_id AND booking_status = 'confirmed'"
+    ),
+    "seat conflict probe": (
+        "SELECT 1 FROM bookings WHERE flight_id = :flight_id AND booking_status = 'confirmed'"
+        " AND seat_number IN ('1A', '1B')"
+    ),
+    "bookings per status on a flight": (
+        "SELECT booking_status, COUNT(*) FROM bookings WHERE flight_id = :flight_id GROUP BY booking_status"
+    ),
+    "a user's latest bookings": (
+        "SELECT id, flight_id, seat_number, booking_reference, booking_status, created_at FROM bookings"
+        " WHERE user_id = :user_id ORDER BY created_at DESC, id DESC LIMIT 20"
+    ),
+}
+
+
+def seed_bookings(connection, count: int, users: int):
+    flight_ids = [row[0] for row in connection.execute(text("SELECT id FROM flights"))]
+    if not flight_ids:
+        print("❌ No flights to attach bookings to; load flights first")
+        sys.exit(1)
+    capacity = 60 * len(seat_map.SEAT_LETTERS)
+    rng = random.Random(0)
+    started = datetime.utcnow() - timedelta(days=365)
+    rows = []
+    for number in range(count):
+        flight_id = flight_ids[number % len(flight_ids)]
+        # Distinct seats per flight; cancelled rows may reuse them freely
+        sequence = number // len(flight_ids)
+        status = "cancelled" if rng.random() < 0.1 else "confirmed"
+        rows.append({
+            "user_id": rng.randint(1, users),
+            "flight_id": flight_id,
+            "booking_reference": f"EXPLAIN-{number}",
+            "seat_number": seat_map.seat_label(sequence % capacity) if sequence < capacity else f"X{sequence}",
+            "booking_status": status,
+            "created_at": started + timedelta(seconds=number),
+            "updated_at": started + timedelta(seconds=number),
+        })
+    connection.execute(Booking.__table__.insert(), rows)
+    print(f"🌱 Seeded {count} synthetic bookings over {len(flight_ids)} flights and {users} users")
+
+
+def explain(connection, sql: str, params: dict):
+    if connection.dialect.name == "postgresql":
+        statement = "EXPLAIN (ANALYZE, BUFFERS, COSTS OFF) " + sql
+    else:
+        statement = "EXPLAIN QUERY PLAN " + sql
+    for row in connection.execute(text(statement), params):
+        print("      " + " | ".join(str(value) for value in row))
+
+
+def show_plans(connection, label: str, params: dict):
+    connection.execute(text("ANALYZE"))
+    print(f"\n📊 {label}")
+    for name, sql in QUERIES.items():
+        print(f"   {name}:")
+        explain(connection, sql, params)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="Synthetic bookings to add inside the transaction")
+    parser.add_argument("--users", type=int, default=5000)
+    args = parser.parse_args()
+
+    upgrade_schema()
+    engine = get_engine()
+    table_indexes = {index.name: index for index in Booking.__table__.indexes}
+    with engine.connect() as connection:
+        # A DML statement first so SQLite also runs the DDL below inside the transaction
+        connection.execute(text("DELETE FROM bookings WHERE 1 = 0"))
+        if args.seed:
+            seed_bookings(connection, args.seed, args.users)
+        sample = connection.execute(text(
+            "SELECT flight_id, user_id FROM bookings WHERE user_id IS NOT NULL LIMIT 1"
+        )).first()
+        params = {"flight_id": sample[0] if sample else 1, "user_id": sample[1] if sample else 1}
+
+        for name in INDEXES:
+            table_indexes[name].drop(bind=connection)
+        show_plans(connection, "Before (without the booking indexes)", params)
+        for name in INDEXES:
+            table_indexes[name].create(bind=connection)
+        show_plans(connection, "After", params)
+        connection.rollback()
+    print("\n↩️  Rolled back; the database is unchanged")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Bulk load flights from a CSV or NDJSON file, inserting new flight numbers
+and updating existing ones.
+
+    python scripts/load_flights.py schedules.csv
+    python scripts/load_flights.py schedules.ndjson --batch-size 10000
+
+CSV files need a header row; both formats use the fields of FlightCreate:
+flight_number, departure_city, arrival_city, departure_time, arrival_time,
+price, available_seats. Existing flights keep their available_seats.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.core.config import settings
+from app.db.migrate import upgrade_schema
+from app.services.flight_loader import LOAD_FORMATS, load_flights_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=LOAD_FORMATS, help="Defaults from the file extension")
+    parser.add_argument("--batch-size", type=int, default=settings.FLIGHT_LOAD_BATCH_SIZE)
+    args = parser.parse_args()
+
+    format = args.format or ("ndjson" if args.path.suffix.lower() in (".ndjson", ".jsonl") else "csv")
+    upgrade_schema()
+    print(f"🚚 Loading {args.path} as {format}...")
+    with open(args.path, "rb") as file:
+        report = load_flights_file(file, format, args.batch_size)
+
+    print(f"✅ Loaded {report['rows_loaded']}/{report['rows_read']} rows in {report['seconds']}s"
+          f" ({report['rows_per_second']} rows/s)")
+    print(f"   inserted: {report['inserted']}, updated: {report['updated']}, rejected: {report['rejected']}")
+    for error in report["errors"]:
+        print(f"   ⚠ line {error['line']}: {error['error']}")
+    if report["rejected"] > len(report["errors"]):
+        print(f"   ... and {report['rejected'] - len(report['errors'])} more rejected rows")
+    sys.exit(1 if report["rejected"] else 0)
+
+if __name__ == "__main__":
+    main()
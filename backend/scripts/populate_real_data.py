@@ -8,6 +8,7 @@ sys.path.insert(0, str(backend_dir))
 from app.core.database import SessionLocal
 from app.models.user import User
 from app.models.flight import Flight
+from app.db.seed import seed_airlines
 from datetime import datetime, timedelta
 import bcrypt
 from sqlalchemy.exc import IntegrityError
@@ -54,7 +55,6 @@ def add_real_airline_data():
             # Domestic India Routes
             Flight(
                 flight_number="AI101",
-                airline="Air India",
                 departure_city="Mumbai",
                 arrival_city="Delhi",
                 departure_time=base_date + timedelta(days=1, hours=6),
@@ -64,7 +64,6 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="6E202",
-                airline="IndiGo",
                 departure_city="Bangalore",
                 arrival_city="Chennai",
                 departure_time=base_date + timedelta(days=1, hours=14),
@@ -74,7 +73,6 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="SG301",
-                airline="SpiceJet",
                 departure_city="Delhi",
                 arrival_city="Goa",
                 departure_time=base_date + timedelta(days=2, hours=8),
@@ -84,7 +82,6 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="UK401",
-                airline="Vistara",
                 departure_city="Mumbai",
                 arrival_city="Bangalore",
                 departure_time=base_date + timedelta(days=2, hours=16),
@@ -94,7 +91,6 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="G8501",
-                airline="GoAir",
                 departure_city="Kolkata",
                 arrival_city="Mumbai",
                 departure_time=base_date + timedelta(days=3, hours=11),
@@ -106,7 +102,6 @@ def add_real_airline_data():
             # International Routes
             Flight(
                 flight_number="AI131",
-                airline="Air India",
                 departure_city="Delhi",
                 arrival_city="London",
                 departure_time=base_date + timedelta(days=5, hours=2),
@@ -116,17 +111,15 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="EK501",
-                airline="Emirates",
                 departure_city="Mumbai",
                 arrival_city="Dubai",
                 departure_time=base_date + timedelta(days=4, hours=3, minutes=30),
                 arrival_time=base_date + timedelta(days=4, hours=6, minutes=45),
                 price=25000.00,
-                available_seeds=350
+                available_seats=350
             ),
             Flight(
                 flight_number="SQ601",
-                airline="Singapore Airlines",
                 departure_city="Bangalore",
                 arrival_city="Singapore",
                 departure_time=base_date + timedelta(days=6, hours=23, minutes=45),
@@ -136,7 +129,6 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="QR701",
-                airline="Qatar Airways",
                 departure_city="Delhi",
                 arrival_city="Doha",
                 departure_time=base_date + timedelta(days=7, hours=4, minutes=15),
@@ -146,7 +138,6 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="TG801",
-                airline="Thai Airways",
                 departure_city="Mumbai",
                 arrival_city="Bangkok",
                 departure_time=base_date + timedelta(days=8, hours=1, minutes=30),
@@ -158,7 +149,6 @@ def add_real_airline_data():
             # Return flights
             Flight(
                 flight_number="AI102",
-                airline="Air India",
                 departure_city="Delhi",
                 arrival_city="Mumbai",
                 departure_time=base_date + timedelta(days=1, hours=20),
@@ -168,7 +158,6 @@ def add_real_airline_data():
             ),
             Flight(
                 flight_number="6E203",
-                airline="IndiGo",
                 departure_city="Chennai",
                 arrival_city="Bangalore",
                 departure_time=base_date + timedelta(days=2, hours=9),
@@ -178,6 +167,19 @@ def add_real_airline_data():
             ),
         ]
         
+        # Airline names for the flight number prefixes used above
+        seed_airlines(db, {
+            "AI": "Air India",
+            "6E": "IndiGo",
+            "SG": "SpiceJet",
+            "UK": "Vistara",
+            "G8": "GoAir",
+            "EK": "Emirates",
+            "SQ": "Singapore Airlines",
+            "QR": "Qatar Airways",
+            "TG": "Thai Airways",
+        })
+        
         # Add users to database
         for user in users:
             try:
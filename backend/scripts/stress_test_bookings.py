@@ -0,0 +1,134 @@
+"""
+Hammer one flight with concurrent bookings and check nothing is oversold.
+
+    python scripts/stress_test_bookings.py --workers 32 --attempts 50 --rows 30
+
+Creates a throwaway flight, lets every worker book random seats on it through
+BookingService (one session per attempt, like a request), then verifies that
+no seat is confirmed twice and that available_seats and the seat map agree
+with the confirmed bookings. Reports successful bookings per second.
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from app.core.database import get_session_factory
+from app.db.migrate import upgrade_schema
+from app.models.booking import Booking
+from app.models.flight import Flight
+from app.schemas.booking import BookingCreateMulti
+from app.services import seat_map
+from app.services.booking_service import BookingService
+
+
+def create_hot_flight(session_factory, seats: int) -> int:
+    db = session_factory()
+    try:
+        departure = datetime.utcnow() + timedelta(days=30)
+        flight = Flight(
+            flight_number=f"ST{uuid.uuid4().hex[:6].upper()}",
+            departure_city="Stress",
+            arrival_city="Test",
+            departure_time=departure,
+            arrival_time=departure + timedelta(hours=2),
+            price=1.0,
+            available_seats=seats
+        )
+        db.add(flight)
+        db.commit()
+        return flight.id
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--attempts", type=int, default=50, help="Booking attempts per worker")
+    parser.add_argument("--rows", type=int, default=30, help="Cabin rows; six seats per row")
+    parser.add_argument("--max-seats", type=int, default=3, help="Seats per booking, chosen uniformly from 1..N")
+    parser.add_argument("--keep", action="store_true", help="Keep the test flight and its bookings")
+    args = parser.parse_args()
+
+    upgrade_schema()
+    session_factory = get_session_factory()
+    capacity = args.rows * len(seat_map.SEAT_LETTERS)
+    flight_id = create_hot_flight(session_factory, capacity)
+    all_seats = [seat_map.seat_label(index) for index in range(capacity)]
+    outcomes = Counter()
+    outcomes_lock = threading.Lock()
+
+    def worker(worker_id: int):
+        rng = random.Random(worker_id)
+        for attempt in range(args.attempts):
+            seats = rng.sample(all_seats, rng.randint(1, args.max_seats))
+            request = BookingCreateMulti(
+                user_id=1,
+                flight_id=flight_id,
+                booking_reference=f"ST-{flight_id}-{worker_id}-{attempt}",
+                seat_numbers=seats
+            )
+            db = session_factory()
+            try:
+                BookingService(db).create_bookings(request)
+                outcome = "booked"
+            except HTTPException as e:
+                outcome = f"rejected {e.status_code}"
+            finally:
+                db.close()
+            with outcomes_lock:
+                outcomes[outcome] += 1
+
+    print(f"🚀 {args.workers} workers x {args.attempts} attempts on flight {flight_id} ({capacity} seats)")
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        list(executor.map(worker, range(args.workers)))
+    elapsed = time.perf_counter() - started
+
+    db = session_factory()
+    try:
+        confirmed = db.query(Booking.seat_number, func.count()).filter(
+            Booking.flight_id == flight_id, Booking.booking_status == "confirmed"
+        ).group_by(Booking.seat_number).all()
+        double_sold = [seat for seat, sold in confirmed if sold > 1]
+        sold = sum(count for _, count in confirmed)
+        flight = db.get(Flight, flight_id)
+        mask = seat_map.from_bytes(flight.seat_map)
+
+        print(f"⏱️  {elapsed:.2f}s, {outcomes['booked'] / elapsed:.1f} bookings/s, {sum(outcomes.values()) / elapsed:.1f} attempts/s")
+        for outcome, count in sorted(outcomes.items()):
+            print(f"   {outcome}: {count}")
+        print(f"   seats sold: {sold}/{capacity}")
+        checks = {
+            "no seat sold twice": not double_sold,
+            "available_seats matches bookings": flight.available_seats == capacity - sold,
+            "seat map matches bookings": mask == seat_map.seat_mask(seat for seat, _ in confirmed),
+        }
+        for check, passed in checks.items():
+            print(f"{'✅' if passed else '❌'} {check}")
+        if double_sold:
+            print(f"   double-sold seats: {', '.join(double_sold)}")
+
+        if not args.keep:
+            db.delete(flight)
+            db.commit()
+    finally:
+        db.close()
+    sys.exit(0 if all(checks.values()) else 1)
+
+if __name__ == "__main__":
+    main()